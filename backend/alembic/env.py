@@ -9,7 +9,7 @@ from alembic import context
 
 from app.core.config import settings
 from app.core.database import Base
-from app.models import User, Topic, Question, StudySession, UserAnswer, MistakeNote
+from app.models import User, Topic, Question, StudySession, UserAnswer, MistakeNote, GenerationJob, UserStats, UserDailyStats
 
 config = context.config
 
@@ -0,0 +1,34 @@
+"""Question inventory indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Inventory draws and bucket level counts per (topic_id, difficulty)
+    op.create_index(
+        'idx_questions_inventory',
+        'questions',
+        ['topic_id', 'difficulty', 'used_count'],
+        postgresql_where=sa.text('is_active'),
+    )
+    # "Already answered by this user" check when drawing from the inventory
+    op.create_index('idx_answers_user_question', 'user_answers', ['user_id', 'question_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_answers_user_question', table_name='user_answers')
+    op.drop_index('idx_questions_inventory', table_name='questions')
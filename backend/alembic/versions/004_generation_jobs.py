@@ -0,0 +1,51 @@
+"""Generation jobs queue
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-02-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'generation_jobs',
+        sa.Column('job_id', postgresql.UUID(as_uuid=True), nullable=False, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('payload', postgresql.JSONB(), nullable=False),
+        sa.Column('result', postgresql.JSONB(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.CheckConstraint("kind IN ('questions', 'session')", name='check_job_kind'),
+        sa.CheckConstraint("status IN ('pending', 'running', 'completed', 'failed')", name='check_job_status'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index('idx_jobs_user', 'generation_jobs', ['user_id'])
+    # Only queued and running jobs are scanned by workers
+    op.create_index(
+        'idx_jobs_queue',
+        'generation_jobs',
+        ['created_at'],
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('generation_jobs')
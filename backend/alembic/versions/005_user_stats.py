@@ -0,0 +1,87 @@
+"""Per-user dashboard stats
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-02-20 00:00:00.000000
+
+Existing users are backfilled here; ``python -m app.cli rebuild-user-stats``
+recomputes the same values later if they drift.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total_questions', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_correct', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_sessions', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_study_time_seconds', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('open_mistakes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('current_streak', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_study_date', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Same values as rebuild_user_stats; the streak is the latest run of
+    # consecutive session days (gaps-and-islands)
+    op.execute("""
+        INSERT INTO user_stats (
+            user_id, total_questions, total_correct, total_sessions,
+            total_study_time_seconds, open_mistakes, current_streak, last_study_date
+        )
+        SELECT u.user_id,
+               coalesce(a.total, 0),
+               coalesce(a.correct, 0),
+               coalesce(s.total, 0),
+               coalesce(s.seconds, 0),
+               coalesce(m.total, 0),
+               coalesce(r.length, 0),
+               r.last_day
+        FROM users AS u
+        LEFT JOIN (
+            SELECT user_id, count(*) AS total, count(*) FILTER (WHERE is_correct) AS correct
+            FROM user_answers
+            GROUP BY user_id
+        ) AS a ON a.user_id = u.user_id
+        LEFT JOIN (
+            SELECT user_id, count(*) AS total, coalesce(sum(duration_seconds), 0) AS seconds
+            FROM study_sessions
+            WHERE status = 'completed'
+            GROUP BY user_id
+        ) AS s ON s.user_id = u.user_id
+        LEFT JOIN (
+            SELECT user_id, count(*) AS total
+            FROM mistake_notes
+            WHERE NOT mastered
+            GROUP BY user_id
+        ) AS m ON m.user_id = u.user_id
+        LEFT JOIN (
+            SELECT DISTINCT ON (user_id) user_id, count(*) AS length, max(day) AS last_day
+            FROM (
+                SELECT user_id, day,
+                       day - CAST(row_number() OVER (PARTITION BY user_id ORDER BY day) AS INTEGER) AS anchor
+                FROM (SELECT DISTINCT user_id, CAST(started_at AS DATE) AS day FROM study_sessions) AS d
+            ) AS i
+            GROUP BY user_id, anchor
+            ORDER BY user_id, max(day) DESC
+        ) AS r ON r.user_id = u.user_id
+        WHERE a.user_id IS NOT NULL OR s.user_id IS NOT NULL
+           OR m.user_id IS NOT NULL OR r.user_id IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('user_stats')
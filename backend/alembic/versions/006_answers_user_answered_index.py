@@ -0,0 +1,26 @@
+"""Index answers by user and time
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-02-22 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Date-range filters on a user's answers (topic and daily stats)
+    op.create_index('idx_answers_user_answered', 'user_answers', ['user_id', 'answered_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_answers_user_answered', table_name='user_answers')
@@ -0,0 +1,49 @@
+"""Daily per-topic answer rollup
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-02-24 00:00:00.000000
+
+Existing answers are rolled up by ``python -m app.cli rebuild-daily-stats``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_daily_stats',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('topic_id', sa.Integer(), nullable=True),
+        sa.Column('local_date', sa.Date(), nullable=False),
+        sa.Column('answers', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('correct', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('time_spent_seconds', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['topic_id'], ['topics.topic_id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # NULLS NOT DISTINCT so topic-less answers upsert into a single row (PostgreSQL 15+)
+    op.create_index(
+        'uq_daily_stats_user_topic_date',
+        'user_daily_stats',
+        ['user_id', 'topic_id', 'local_date'],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+    op.create_index('idx_daily_stats_user_date', 'user_daily_stats', ['user_id', 'local_date'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_daily_stats_user_date', table_name='user_daily_stats')
+    op.drop_index('uq_daily_stats_user_topic_date', table_name='user_daily_stats')
+    op.drop_table('user_daily_stats')
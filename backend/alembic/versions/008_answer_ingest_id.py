@@ -0,0 +1,29 @@
+"""Idempotency key for buffered answer ingestion
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-02-27 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user_answers', sa.Column('ingest_id', postgresql.UUID(as_uuid=True), nullable=True))
+    # NULLs stay distinct, so directly written answers are unaffected
+    op.create_index('uq_answers_ingest_id', 'user_answers', ['ingest_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_answers_ingest_id', table_name='user_answers')
+    op.drop_column('user_answers', 'ingest_id')
@@ -0,0 +1,69 @@
+"""Keyset pagination indexes and list totals in user_stats
+
+Revision ID: 009
+Revises: 008
+Create Date: 2024-02-29 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # List totals, so the paged lists never count rows
+    for name in ('total_mistakes', 'sessions_started', 'session_questions', 'session_correct'):
+        op.add_column('user_stats', sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+
+    op.execute("""
+        UPDATE user_stats AS s
+        SET sessions_started = t.started,
+            session_questions = t.questions,
+            session_correct = t.correct
+        FROM (
+            SELECT user_id,
+                   count(*) AS started,
+                   coalesce(sum(questions_attempted) FILTER (WHERE status = 'completed'), 0) AS questions,
+                   coalesce(sum(correct_answers) FILTER (WHERE status = 'completed'), 0) AS correct
+            FROM study_sessions
+            GROUP BY user_id
+        ) AS t
+        WHERE s.user_id = t.user_id
+    """)
+    op.execute("""
+        UPDATE user_stats AS s
+        SET total_mistakes = t.total
+        FROM (SELECT user_id, count(*) AS total FROM mistake_notes GROUP BY user_id) AS t
+        WHERE s.user_id = t.user_id
+    """)
+
+    # Newest-first pages continue after the last (timestamp, id) seen
+    op.create_index(
+        'idx_sessions_user_started', 'study_sessions', ['user_id', 'started_at', 'session_id']
+    )
+    op.create_index(
+        'idx_sessions_user_status_ended', 'study_sessions', ['user_id', 'status', 'ended_at', 'session_id']
+    )
+    op.create_index(
+        'idx_mistakes_user_first', 'mistake_notes', ['user_id', 'first_mistake_at', 'note_id']
+    )
+    op.create_index(
+        'idx_mistakes_user_mastered_first', 'mistake_notes',
+        ['user_id', 'mastered', 'first_mistake_at', 'note_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_mistakes_user_mastered_first', table_name='mistake_notes')
+    op.drop_index('idx_mistakes_user_first', table_name='mistake_notes')
+    op.drop_index('idx_sessions_user_status_ended', table_name='study_sessions')
+    op.drop_index('idx_sessions_user_started', table_name='study_sessions')
+    for name in ('session_correct', 'session_questions', 'sessions_started', 'total_mistakes'):
+        op.drop_column('user_stats', name)
@@ -5,7 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import password_hasher, PasswordHasherBusy, create_access_token
 from app.models import User
 from app.schemas import UserCreate, UserLogin, UserResponse, AuthResponse, MessageResponse
 from app.api.deps import get_current_user
@@ -13,6 +13,14 @@ from app.api.deps import get_current_user
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
+def hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
@@ -29,10 +37,16 @@ async def register(
             detail="Email already registered",
         )
 
+    # Hash off the event loop
+    try:
+        password_hash = await password_hasher.hash(user_data.password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
+
     # Create new user
     new_user = User(
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=password_hash,
         name=user_data.name,
     )
 
@@ -66,8 +80,15 @@ async def login(
             detail="Invalid email or password",
         )
 
-    # Verify password
-    if not verify_password(login_data.password, user.password_hash):
+    # Verify password off the event loop
+    try:
+        valid, new_hash = await password_hasher.verify_and_update(
+            login_data.password, user.password_hash
+        )
+    except PasswordHasherBusy:
+        raise hasher_busy()
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -80,8 +101,10 @@ async def login(
             detail="User account is deactivated",
         )
 
-    # Update last login time
+    # Update last login time, and the hash if BCRYPT_ROUNDS changed
     user.last_login_at = datetime.utcnow()
+    if new_hash is not None:
+        user.password_hash = new_hash
     await db.commit()
     await db.refresh(user)
 
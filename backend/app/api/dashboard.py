@@ -1,20 +1,29 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select, func, cast, Date, Integer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.models import Topic, Question, User, StudySession, UserAnswer, MistakeNote
+from app.models import Topic, Question, User, UserAnswer, UserStats, UserDailyStats
 from app.schemas import (
     DashboardSummaryResponse,
     TopicStatResponse,
     TopicStatsResponse,
     DailyStatResponse,
+    DailyStatsResponse,
     WeeklyStatsResponse,
+    MonthlyStatResponse,
+    MonthlyStatsResponse,
+    HeatmapDayResponse,
+    HeatmapResponse,
 )
 from app.api.deps import get_current_user
+from app.services.user_stats import daily_totals, displayed_streak, local_day
 
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
@@ -25,203 +34,299 @@ async def get_summary(
     current_user: User = Depends(get_current_user),
 ):
     """학습 요약 조회"""
-    # Get total questions and correct answers
-    result = await db.execute(
-        select(
-            func.count(UserAnswer.answer_id).label("total_questions"),
-            func.sum(cast(UserAnswer.is_correct, Integer)).label("total_correct"),
-        ).where(UserAnswer.user_id == current_user.user_id)
-    )
-    answer_stats = result.first()
-
-    total_questions = answer_stats.total_questions or 0
-    total_correct = answer_stats.total_correct or 0
-    accuracy_rate = Decimal(total_correct / total_questions * 100) if total_questions > 0 else None
-
-    # Get session stats
-    result = await db.execute(
-        select(
-            func.count(StudySession.session_id).label("total_sessions"),
-            func.coalesce(func.sum(StudySession.duration_seconds), 0).label("total_time"),
-        ).where(
-            StudySession.user_id == current_user.user_id,
-            StudySession.status == "completed",
-        )
-    )
-    session_stats = result.first()
-
-    total_sessions = session_stats.total_sessions or 0
-    total_study_time = session_stats.total_time or 0
-
-    # Get mistake count
-    result = await db.execute(
-        select(func.count(MistakeNote.note_id)).where(
-            MistakeNote.user_id == current_user.user_id,
-            MistakeNote.mastered == False,
+    # Totals are maintained by the answer and session endpoints
+    stats = await db.get(UserStats, current_user.user_id)
+    if stats is None:
+        return DashboardSummaryResponse(
+            total_questions=0,
+            total_correct=0,
+            total_sessions=0,
+            total_study_time_seconds=0,
+            current_streak=0,
+            mistake_count=0,
         )
-    )
-    mistake_count = result.scalar() or 0
 
-    # Calculate streak (consecutive days with study sessions)
-    streak = await calculate_streak(db, current_user.user_id)
+    total_questions = stats.total_questions
+    total_correct = stats.total_correct
+    accuracy_rate = Decimal(total_correct / total_questions * 100) if total_questions > 0 else None
 
     return DashboardSummaryResponse(
         total_questions=total_questions,
         total_correct=total_correct,
         accuracy_rate=accuracy_rate,
-        total_sessions=total_sessions,
-        total_study_time_seconds=total_study_time,
-        current_streak=streak,
-        mistake_count=mistake_count,
+        total_sessions=stats.total_sessions,
+        total_study_time_seconds=stats.total_study_time_seconds,
+        current_streak=displayed_streak(stats),
+        mistake_count=stats.open_mistakes,
     )
 
 
-async def calculate_streak(db: AsyncSession, user_id: int) -> int:
-    """Calculate consecutive study days streak."""
-    today = datetime.utcnow().date()
-    streak = 0
-    current_date = today
-
-    while True:
-        result = await db.execute(
-            select(func.count(StudySession.session_id)).where(
-                StudySession.user_id == user_id,
-                cast(StudySession.started_at, Date) == current_date,
-            )
-        )
-        count = result.scalar() or 0
-
-        if count > 0:
-            streak += 1
-            current_date -= timedelta(days=1)
-        else:
-            # If today has no session, check if yesterday had one
-            if current_date == today:
-                current_date -= timedelta(days=1)
-                continue
-            break
-
-    return streak
-
-
 @router.get("/stats/topics", response_model=TopicStatsResponse)
 async def get_topic_stats(
+    difficulty: Optional[str] = Query(default=None, pattern="^(easy|medium|hard)$"),
+    date_from: Optional[date] = Query(default=None, alias="from"),
+    date_to: Optional[date] = Query(default=None, alias="to"),
+    tz: Optional[str] = Query(default=None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """주제별 통계 조회"""
-    # Get all topics with user's stats
+    # Aggregate the user's answers per topic once, then attach to every active topic
+    zone = resolve_timezone(tz)
+    filters = [UserAnswer.user_id == current_user.user_id]
+    if difficulty is not None:
+        filters.append(Question.difficulty == difficulty)
+    # Local days, like the other dashboard ranges
+    if date_from is not None:
+        filters.append(UserAnswer.answered_at >= local_midnight_utc(date_from, zone))
+    if date_to is not None:
+        filters.append(UserAnswer.answered_at < local_midnight_utc(date_to + timedelta(days=1), zone))
+
+    per_topic = (
+        select(
+            Question.topic_id.label("topic_id"),
+            func.count(UserAnswer.answer_id).label("total"),
+            func.sum(cast(UserAnswer.is_correct, Integer)).label("correct"),
+        )
+        .select_from(UserAnswer)
+        .join(Question, UserAnswer.question_id == Question.question_id)
+        .where(*filters)
+        .group_by(Question.topic_id)
+        .subquery()
+    )
     result = await db.execute(
         select(
             Topic.topic_id,
             Topic.name,
             Topic.code,
-            func.count(UserAnswer.answer_id).label("total_questions"),
-            func.coalesce(func.sum(cast(UserAnswer.is_correct, Integer)), 0).label("correct_answers"),
-        )
-        .select_from(Topic)
-        .outerjoin(
-            UserAnswer,
-            (UserAnswer.user_id == current_user.user_id) &
-            (UserAnswer.question_id.in_(
-                select(Question.question_id)
-                .where(Question.topic_id == Topic.topic_id)
-            ))
+            func.coalesce(per_topic.c.total, 0).label("total"),
+            func.coalesce(per_topic.c.correct, 0).label("correct"),
         )
+        .outerjoin(per_topic, per_topic.c.topic_id == Topic.topic_id)
         .where(Topic.is_active == True)
-        .group_by(Topic.topic_id, Topic.name, Topic.code)
         .order_by(Topic.display_order)
     )
 
-    # Get topics and calculate stats for each
-    result = await db.execute(
-        select(Topic).where(Topic.is_active == True).order_by(Topic.display_order)
+    stats = []
+    for row in result:
+        accuracy = Decimal(row.correct / row.total * 100) if row.total > 0 else None
+        stats.append(TopicStatResponse(
+            topic_id=row.topic_id,
+            topic_name=row.name,
+            topic_code=row.code,
+            total_questions=row.total,
+            correct_answers=row.correct,
+            accuracy_rate=accuracy,
+        ))
+
+    return TopicStatsResponse(
+        stats=stats,
+        count=len(stats),
     )
-    topics = result.scalars().all()
 
-    stats = []
-    for topic in topics:
-        # Get stats for each topic
+
+def resolve_timezone(tz: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz or settings.DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown timezone: {tz}",
+        )
+
+
+def local_midnight_utc(day: date, zone: ZoneInfo) -> datetime:
+    """Start of ``day`` in ``zone`` as a naive UTC datetime (how answered_at is stored)."""
+    return datetime.combine(day, time(), tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def daily_stats(
+    db: AsyncSession,
+    user_id: int,
+    date_from: date,
+    date_to: date,
+    zone: ZoneInfo,
+) -> DailyStatsResponse:
+    """Per-day answer counts for [date_from, date_to] in ``zone``, zero-filled."""
+    if zone.key == settings.DEFAULT_TIMEZONE:
+        # The rollup is bucketed in the default timezone: O(days) rows
+        by_day = await daily_totals(db, user_id, date_from, date_to)
+    else:
+        # Other timezones regroup raw answers; the range stays on the raw
+        # column so idx_answers_user_answered is used
+        day = local_day(UserAnswer.answered_at, zone.key)
         result = await db.execute(
             select(
-                func.count(UserAnswer.answer_id).label("total"),
-                func.coalesce(func.sum(cast(UserAnswer.is_correct, Integer)), 0).label("correct"),
+                day,
+                func.count(UserAnswer.answer_id),
+                func.coalesce(func.sum(cast(UserAnswer.is_correct, Integer)), 0),
+                func.coalesce(func.sum(UserAnswer.time_spent_seconds), 0),
             )
-            .select_from(UserAnswer)
-            .join(Question, UserAnswer.question_id == Question.question_id)
             .where(
-                UserAnswer.user_id == current_user.user_id,
-                Question.topic_id == topic.topic_id,
+                UserAnswer.user_id == user_id,
+                UserAnswer.answered_at >= local_midnight_utc(date_from, zone),
+                UserAnswer.answered_at < local_midnight_utc(date_to + timedelta(days=1), zone),
             )
+            .group_by(day)
         )
-        topic_stats = result.first()
-
-        total = topic_stats.total or 0
-        correct = topic_stats.correct or 0
-        accuracy = Decimal(correct / total * 100) if total > 0 else None
+        by_day = {row[0]: tuple(row[1:]) for row in result}
 
-        stats.append(TopicStatResponse(
-            topic_id=topic.topic_id,
-            topic_name=topic.name,
-            topic_code=topic.code,
-            total_questions=total,
-            correct_answers=correct,
-            accuracy_rate=accuracy,
+    daily = []
+    total_questions = 0
+    total_correct = 0
+    for i in range((date_to - date_from).days + 1):
+        current_date = date_from + timedelta(days=i)
+        questions, correct, seconds = by_day.get(current_date, (0, 0, 0))
+        daily.append(DailyStatResponse(
+            date=current_date,
+            questions_count=questions,
+            correct_count=correct,
+            accuracy_rate=Decimal(correct / questions * 100) if questions > 0 else None,
+            time_spent_seconds=seconds,
         ))
+        total_questions += questions
+        total_correct += correct
 
-    return TopicStatsResponse(
-        stats=stats,
-        count=len(stats),
+    return DailyStatsResponse(
+        date_from=date_from,
+        date_to=date_to,
+        timezone=zone.key,
+        daily_stats=daily,
+        total_questions=total_questions,
+        total_correct=total_correct,
+        average_accuracy=(
+            Decimal(total_correct / total_questions * 100) if total_questions > 0 else None
+        ),
     )
 
 
+@router.get("/stats/daily", response_model=DailyStatsResponse)
+async def get_daily_stats(
+    date_from: Optional[date] = Query(default=None, alias="from"),
+    date_to: Optional[date] = Query(default=None, alias="to"),
+    tz: Optional[str] = Query(default=None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """일별 통계 조회 (기간·시간대 지정, 최대 1년)"""
+    zone = resolve_timezone(tz)
+    date_to = date_to or datetime.now(zone).date()
+    date_from = date_from or date_to - timedelta(days=6)
+
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'",
+        )
+    if (date_to - date_from).days + 1 > settings.STATS_MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range is limited to {settings.STATS_MAX_RANGE_DAYS} days",
+        )
+
+    return await daily_stats(db, current_user.user_id, date_from, date_to, zone)
+
+
 @router.get("/stats/weekly", response_model=WeeklyStatsResponse)
 async def get_weekly_stats(
+    tz: Optional[str] = Query(default=None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """주간 통계 조회"""
-    today = datetime.utcnow().date()
-    week_ago = today - timedelta(days=6)
+    # Served from the rollup in the default timezone, from raw answers otherwise
+    zone = resolve_timezone(tz)
+    today = datetime.now(zone).date()
+    stats = await daily_stats(db, current_user.user_id, today - timedelta(days=6), today, zone)
 
-    daily_stats = []
-    total_questions = 0
-    total_correct = 0
+    return WeeklyStatsResponse(
+        daily_stats=stats.daily_stats,
+        total_questions=stats.total_questions,
+        total_correct=stats.total_correct,
+        average_accuracy=stats.average_accuracy,
+    )
 
-    # Get stats for each day in the past week
-    for i in range(7):
-        current_date = week_ago + timedelta(days=i)
 
-        result = await db.execute(
-            select(
-                func.count(UserAnswer.answer_id).label("questions"),
-                func.coalesce(func.sum(cast(UserAnswer.is_correct, Integer)), 0).label("correct"),
-            ).where(
-                UserAnswer.user_id == current_user.user_id,
-                cast(UserAnswer.answered_at, Date) == current_date,
-            )
-        )
-        day_stats = result.first()
+def add_months(month: date, delta: int) -> date:
+    index = month.year * 12 + month.month - 1 + delta
+    return date(index // 12, index % 12 + 1, 1)
 
-        questions = day_stats.questions or 0
-        correct = day_stats.correct or 0
-        accuracy = Decimal(correct / questions * 100) if questions > 0 else None
 
-        daily_stats.append(DailyStatResponse(
-            date=current_date,
+@router.get("/stats/monthly", response_model=MonthlyStatsResponse)
+async def get_monthly_stats(
+    months: int = Query(default=6, ge=1, le=24),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """월별 통계 조회"""
+    zone = resolve_timezone(None)
+    this_month = datetime.now(zone).date().replace(day=1)
+    first_month = add_months(this_month, -(months - 1))
+
+    month_start = cast(func.date_trunc("month", UserDailyStats.local_date), Date)
+    result = await db.execute(
+        select(
+            month_start,
+            func.sum(UserDailyStats.answers),
+            func.sum(UserDailyStats.correct),
+            func.sum(UserDailyStats.time_spent_seconds),
+        )
+        .where(
+            UserDailyStats.user_id == current_user.user_id,
+            UserDailyStats.local_date >= first_month,
+        )
+        .group_by(month_start)
+    )
+    by_month = {month: (answers, correct, int(seconds)) for month, answers, correct, seconds in result}
+
+    monthly = []
+    total_questions = 0
+    total_correct = 0
+    for i in range(months):
+        current_month = add_months(first_month, i)
+        questions, correct, seconds = by_month.get(current_month, (0, 0, 0))
+        monthly.append(MonthlyStatResponse(
+            month=current_month,
             questions_count=questions,
             correct_count=correct,
-            accuracy_rate=accuracy,
+            accuracy_rate=Decimal(correct / questions * 100) if questions > 0 else None,
+            time_spent_seconds=seconds,
         ))
-
         total_questions += questions
         total_correct += correct
 
-    average_accuracy = Decimal(total_correct / total_questions * 100) if total_questions > 0 else None
-
-    return WeeklyStatsResponse(
-        daily_stats=daily_stats,
+    return MonthlyStatsResponse(
+        timezone=zone.key,
+        monthly_stats=monthly,
         total_questions=total_questions,
         total_correct=total_correct,
-        average_accuracy=average_accuracy,
+        average_accuracy=(
+            Decimal(total_correct / total_questions * 100) if total_questions > 0 else None
+        ),
+    )
+
+
+@router.get("/stats/heatmap", response_model=HeatmapResponse)
+async def get_heatmap(
+    days: int = Query(default=365, ge=1, le=settings.STATS_MAX_RANGE_DAYS),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """학습 히트맵 조회 (답안이 있는 날만)"""
+    zone = resolve_timezone(None)
+    date_to = datetime.now(zone).date()
+    date_from = date_to - timedelta(days=days - 1)
+    by_day = await daily_totals(db, current_user.user_id, date_from, date_to)
+
+    active = [
+        HeatmapDayResponse(date=day, questions_count=questions, correct_count=correct)
+        for day, (questions, correct, _) in sorted(by_day.items())
+    ]
+    return HeatmapResponse(
+        date_from=date_from,
+        date_to=date_to,
+        timezone=zone.key,
+        days=active,
+        active_days=len(active),
+        max_count=max((day.questions_count for day in active), default=0),
     )
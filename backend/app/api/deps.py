@@ -5,18 +5,17 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import decode_access_token
 from app.models import User
+from app.services.auth_cache import auth_cache
 
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    token = credentials.credentials
+async def load_token_user(token: str, db: AsyncSession) -> User:
+    """Verify ``token`` and load its user, caching the result."""
     payload = decode_access_token(token)
 
     if payload is None:
@@ -44,6 +43,20 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    auth_cache.set(token, user, payload.get("exp"))
+    return user
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    token = credentials.credentials
+    # A cached entry means the token was verified and the user loaded recently
+    user = auth_cache.get(token)
+    if user is None:
+        user = await load_token_user(token, db)
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -53,6 +66,18 @@ async def get_current_user(
     return user
 
 
+async def get_admin_user(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    """An active user listed in ``ADMIN_EMAILS``."""
+    if current_user.email.lower() not in settings.admin_emails_list:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
+
+
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
     db: AsyncSession = Depends(get_db),
@@ -61,19 +86,14 @@ async def get_current_user_optional(
         return None
 
     token = credentials.credentials
-    payload = decode_access_token(token)
-
-    if payload is None:
-        return None
-
-    user_id: Optional[int] = payload.get("sub")
-    if user_id is None:
-        return None
-
-    result = await db.execute(select(User).where(User.user_id == int(user_id)))
-    user = result.scalar_one_or_none()
+    user = auth_cache.get(token)
+    if user is None:
+        try:
+            user = await load_token_user(token, db)
+        except HTTPException:
+            return None
 
-    if user is None or not user.is_active:
+    if not user.is_active:
         return None
 
     return user
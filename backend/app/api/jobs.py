@@ -0,0 +1,82 @@
+import asyncio
+from typing import AsyncIterator
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db, async_session_maker
+from app.models import User, GenerationJob
+from app.schemas import JobResponse
+from app.api.deps import get_current_user
+from app.api.study import sse_event
+from app.services.job_queue import TERMINAL_STATUSES
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+async def get_user_job(db: AsyncSession, job_id: UUID, user_id: int) -> GenerationJob:
+    result = await db.execute(
+        select(GenerationJob).where(
+            GenerationJob.job_id == job_id,
+            GenerationJob.user_id == user_id,
+        )
+    )
+    job = result.scalar_one_or_none()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """생성 작업 상태 조회"""
+    job = await get_user_job(db, job_id, current_user.user_id)
+    return JobResponse.model_validate(job)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """생성 작업 상태 구독 (SSE)
+
+    Sends a ``job`` event whenever the status changes and closes the stream
+    once the job is completed or failed.
+    """
+    await get_user_job(db, job_id, current_user.user_id)
+
+    return StreamingResponse(
+        watch_job(job_id, current_user.user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def watch_job(job_id: UUID, user_id: int) -> AsyncIterator[str]:
+    # The request-scoped session is closed before the body is streamed
+    last_status = None
+    while True:
+        async with async_session_maker() as db:
+            job = await get_user_job(db, job_id, user_id)
+            response = JobResponse.model_validate(job)
+
+        if response.status != last_status:
+            last_status = response.status
+            yield sse_event("job", response)
+        if response.status in TERMINAL_STATUSES:
+            return
+        await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
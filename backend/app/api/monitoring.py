@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_admin_user
+from app.core.security import password_hasher
+from app.schemas import LLMMonitoringResponse, AuthMonitoringResponse, IngestMonitoringResponse
+from app.services import question_inventory, dedup_index, llm_breaker
+from app.services.answer_buffer import answer_buffer
+from app.services.auth_cache import auth_cache
+from app.services.llm_cache import llm_cache
+from app.services.llm_metrics import llm_metrics
+
+# Operational internals (costs, usage, breaker and cache state): admins only
+router = APIRouter(
+    prefix="/api/monitoring",
+    tags=["Monitoring"],
+    dependencies=[Depends(get_admin_user)],
+)
+
+
+@router.get("/llm", response_model=LLMMonitoringResponse)
+async def get_llm_status():
+    """LLM 상태 조회 (호출 지표, 서킷 브레이커, 대체 출제, 캐시, 중복 검출)
+
+    ``metrics`` has latency/TTFT/token histograms and token, cost and
+    yield totals per model and per topic/difficulty. Counters are per
+    worker process.
+    """
+    return LLMMonitoringResponse(
+        metrics=llm_metrics.snapshot(),
+        breaker=llm_breaker.stats(),
+        inventory=question_inventory.stats(),
+        cache=llm_cache.stats(),
+        dedup=dedup_index.stats(),
+    )
+
+
+@router.get("/auth", response_model=AuthMonitoringResponse)
+async def get_auth_status():
+    """인증 상태 조회 (토큰 캐시 적중률, 비밀번호 해시 대기열) - 워커 프로세스별"""
+    return AuthMonitoringResponse(
+        cache=auth_cache.stats(),
+        password_hashing=password_hasher.stats(),
+    )
+
+
+@router.get("/ingest", response_model=IngestMonitoringResponse)
+async def get_ingest_status():
+    """답안 수집 상태 조회 (쓰기 지연 버퍼: 미반영 건수, 배치, 복구)"""
+    return IngestMonitoringResponse(answer_buffer=answer_buffer.stats())
@@ -0,0 +1,59 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+
+
+# Lists are ordered newest first by (timestamp, id) and each page continues
+# strictly after the last row of the previous one, so a page costs one index
+# range scan however deep it is, and rows added meanwhile never shift a page.
+
+def encode_cursor(position: datetime, key) -> str:
+    """Opaque cursor pointing just past the row at (``position``, ``key``)."""
+    raw = json.dumps([position.isoformat(), str(key)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parse_key: Callable[[str], T]) -> Tuple[datetime, T]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position, key = json.loads(raw)
+        return datetime.fromisoformat(position), parse_key(key)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def keyset_page(
+    query: Select,
+    position: InstrumentedAttribute,
+    key: InstrumentedAttribute,
+    cursor: Optional[str],
+    limit: int,
+    parse_key: Callable[[str], T],
+) -> Select:
+    """Order ``query`` newest first and select one row past ``limit`` after ``cursor``."""
+    if cursor is not None:
+        query = query.where(tuple_(position, key) < decode_cursor(cursor, parse_key))
+    return query.order_by(position.desc(), key.desc()).limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence[T],
+    limit: int,
+    position_of: Callable[[T], Tuple[datetime, object]],
+) -> Tuple[List[T], Optional[str]]:
+    """The rows to return and the cursor of the next page, if there is one."""
+    page = list(rows[:limit])
+    if len(rows) <= limit:
+        return page, None
+    return page, encode_cursor(*position_of(page[-1]))
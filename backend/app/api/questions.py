@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.models import Topic, Question, User, UserAnswer, MistakeNote
+from app.models import Topic, Question, User
 from app.schemas import (
     TopicResponse,
     TopicListResponse,
@@ -13,9 +15,14 @@ from app.schemas import (
     QuestionGenerateResponse,
     AnswerSubmitRequest,
     AnswerSubmitResponse,
+    JobResponse,
 )
 from app.api.deps import get_current_user
-from app.services import openai_service
+from app.api.study import session_not_active
+from app.services import question_inventory
+from app.services.job_queue import enqueue_job
+from app.services.answer_buffer import answer_buffer, AnswerBufferFull
+from app.services.answer_writer import write_answer
 
 router = APIRouter(prefix="/api/questions", tags=["Questions"])
 
@@ -38,13 +45,36 @@ async def get_topics(
     )
 
 
-@router.post("/generate", response_model=QuestionGenerateResponse)
+@router.post(
+    "/generate",
+    response_model=QuestionGenerateResponse,
+    responses={202: {"model": JobResponse}},
+)
 async def generate_questions(
     request: QuestionGenerateRequest,
+    async_job: bool = Query(False, alias="async"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """AI 문제 생성"""
+    if async_job:
+        job = await enqueue_job(
+            db, current_user.user_id, "questions", request.model_dump(mode="json")
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=JobResponse.model_validate(job).model_dump(mode="json"),
+        )
+
+    return await generate_for_user(db, current_user.user_id, request)
+
+
+async def generate_for_user(
+    db: AsyncSession,
+    user_id: int,
+    request: QuestionGenerateRequest,
+) -> QuestionGenerateResponse:
+    """Shared by the endpoint and the job worker."""
     # Get topic
     result = await db.execute(
         select(Topic).where(Topic.topic_id == request.topic_id)
@@ -57,12 +87,14 @@ async def generate_questions(
             detail="Topic not found",
         )
 
-    # Generate questions using OpenAI GPT API
+    # Draw from the question inventory, generating only on a miss
     try:
-        generated = await openai_service.generate_questions(
-            topic_name=topic.name,
+        saved_questions = await question_inventory.draw(
+            db,
+            topic=topic,
             difficulty=request.difficulty,
             count=request.count,
+            user_id=user_id,
         )
     except ValueError as e:
         raise HTTPException(
@@ -70,36 +102,15 @@ async def generate_questions(
             detail=str(e),
         )
 
-    if not generated:
+    if not saved_questions:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate questions",
         )
 
-    # Save questions to database
-    saved_questions = []
-    for q in generated:
-        question = Question(
-            topic_id=topic.topic_id,
-            question_text=q.question_text,
-            option_a=q.option_a,
-            option_b=q.option_b,
-            option_c=q.option_c,
-            option_d=q.option_d,
-            correct_answer=q.correct_answer,
-            explanation=q.explanation,
-            difficulty=q.difficulty,
-            source="gpt",
-        )
-        db.add(question)
-        saved_questions.append(question)
-
+    # Inventory rows are already loaded and new rows get their IDs on flush
     await db.commit()
 
-    # Refresh to get IDs
-    for q in saved_questions:
-        await db.refresh(q)
-
     return QuestionGenerateResponse(
         questions=[QuestionResponse.model_validate(q) for q in saved_questions],
         topic=TopicResponse.model_validate(topic),
@@ -136,62 +147,90 @@ async def submit_answer(
     current_user: User = Depends(get_current_user),
 ):
     """답안 제출"""
-    # Get question
-    result = await db.execute(
-        select(Question).where(Question.question_id == question_id)
-    )
-    question = result.scalar_one_or_none()
+    user_answer = request.user_answer.lower()
+    if answer_buffer.running:
+        return await submit_buffered_answer(question_id, request, user_answer, db, current_user.user_id)
 
-    if not question:
+    # Grading and every counter update run as one statement
+    try:
+        row = await write_answer(
+            db,
+            current_user.user_id,
+            question_id,
+            user_answer,
+            time_spent_seconds=request.time_spent_seconds,
+            session_id=request.session_id,
+        )
+    except IntegrityError:
+        # Unknown session_id; ownership and status are checked through the returned row
+        await db.rollback()
+        raise await session_not_active(db, request.session_id, current_user.user_id)
+
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Question not found",
         )
 
-    # Check answer
-    is_correct = request.user_answer.lower() == question.correct_answer.lower()
+    if request.session_id is not None and row.questions_attempted is None:
+        await db.rollback()
+        raise await session_not_active(db, request.session_id, current_user.user_id)
 
-    # Save user answer
-    user_answer = UserAnswer(
-        user_id=current_user.user_id,
+    await db.commit()
+
+    return AnswerSubmitResponse(
+        is_correct=row.is_correct,
+        correct_answer=row.correct_answer,
+        user_answer=user_answer,
+        explanation=row.explanation,
         question_id=question_id,
-        user_answer=request.user_answer.lower(),
-        is_correct=is_correct,
-        time_spent_seconds=request.time_spent_seconds,
+        session_questions_attempted=row.questions_attempted,
+        session_correct_answers=row.correct_answers,
     )
-    db.add(user_answer)
-
-    # Update question used count
-    question.used_count += 1
-
-    # If wrong, add to mistake notes
-    if not is_correct:
-        # Check if already in mistake notes
-        result = await db.execute(
-            select(MistakeNote).where(
-                MistakeNote.user_id == current_user.user_id,
-                MistakeNote.question_id == question_id,
-            )
+
+
+async def submit_buffered_answer(
+    question_id: int,
+    request: AnswerSubmitRequest,
+    user_answer: str,
+    db: AsyncSession,
+    user_id: int,
+) -> AnswerSubmitResponse:
+    """Grade from the cached key and acknowledge once the answer is in the log.
+
+    Counters, mistake notes and session progress are written with the next
+    batch, so the response carries no session counters.
+    """
+    key = await answer_buffer.answer_key(db, question_id)
+    if key is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found",
         )
-        existing_note = result.scalar_one_or_none()
-
-        if existing_note:
-            existing_note.mistake_count += 1
-            existing_note.last_mistake_at = user_answer.answered_at
-        else:
-            mistake_note = MistakeNote(
-                user_id=current_user.user_id,
-                question_id=question_id,
-            )
-            db.add(mistake_note)
 
-    await db.commit()
+    is_correct = user_answer == key.correct_answer.lower()
+    try:
+        await answer_buffer.submit(
+            user_id,
+            question_id,
+            key,
+            user_answer,
+            is_correct,
+            time_spent_seconds=request.time_spent_seconds,
+            session_id=request.session_id,
+        )
+    except AnswerBufferFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
 
     return AnswerSubmitResponse(
         is_correct=is_correct,
-        correct_answer=question.correct_answer,
-        user_answer=request.user_answer.lower(),
-        explanation=question.explanation,
+        correct_answer=key.correct_answer,
+        user_answer=user_answer,
+        explanation=key.explanation,
         question_id=question_id,
     )
 
@@ -1,40 +1,79 @@
+import asyncio
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import AsyncIterator, Optional, Tuple
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import select, func, Integer
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import select, insert, update, func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.models import Topic, Question, User, StudySession, UserAnswer, MistakeNote
+from app.core.database import get_db, async_session_maker
+from app.models import Topic, Question, User, StudySession, UserAnswer, MistakeNote, UserStats
 from app.schemas import (
     TopicResponse,
     QuestionWithAnswerResponse,
     SessionCreateRequest,
     SessionCreateResponse,
     SessionQuestionResponse,
+    SessionStreamStartResponse,
+    SessionStreamDoneResponse,
     SessionResponse,
     SessionResultResponse,
     SessionListResponse,
+    SessionAnswersRequest,
+    SessionAnswersResponse,
+    AnswerSubmitResponse,
     MistakeNoteResponse,
     MistakeListResponse,
     StudyHistoryResponse,
+    MessageResponse,
+    JobResponse,
 )
 from app.api.deps import get_current_user
-from app.services import openai_service
+from app.api.pagination import keyset_page, split_page
+from app.services import openai_service, question_inventory, dedup_index
+from app.services.question_inventory import insert_questions
+from app.services.job_queue import enqueue_job
+from app.services.user_stats import EMPTY_STATS, record_answers, record_session_start, record_session_end
 
 router = APIRouter(prefix="/api/study", tags=["Study"])
 
 
-@router.post("/sessions", response_model=SessionCreateResponse)
+@router.post(
+    "/sessions",
+    response_model=SessionCreateResponse,
+    responses={202: {"model": JobResponse}},
+)
 async def create_session(
     request: SessionCreateRequest,
+    async_job: bool = Query(False, alias="async"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """학습 세션 시작"""
+    if async_job:
+        job = await enqueue_job(
+            db, current_user.user_id, "session", request.model_dump(mode="json")
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=JobResponse.model_validate(job).model_dump(mode="json"),
+        )
+
+    return await start_session(db, current_user.user_id, request)
+
+
+async def start_session(
+    db: AsyncSession,
+    user_id: int,
+    request: SessionCreateRequest,
+) -> SessionCreateResponse:
+    """Shared by the endpoint and the job worker."""
     # Get topic
     result = await db.execute(
         select(Topic).where(Topic.topic_id == request.topic_id)
@@ -47,12 +86,14 @@ async def create_session(
             detail="Topic not found",
         )
 
-    # Generate questions using OpenAI GPT API
+    # Draw from the question inventory, generating only on a miss
     try:
-        generated = await openai_service.generate_questions(
-            topic_name=topic.name,
+        saved_questions = await question_inventory.draw(
+            db,
+            topic=topic,
             difficulty=request.difficulty,
             count=request.question_count,
+            user_id=user_id,
         )
     except ValueError as e:
         raise HTTPException(
@@ -60,47 +101,22 @@ async def create_session(
             detail=str(e),
         )
 
-    if not generated:
+    if not saved_questions:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate questions",
         )
 
-    # Save questions to database
-    saved_questions = []
-    for q in generated:
-        question = Question(
-            topic_id=topic.topic_id,
-            question_text=q.question_text,
-            option_a=q.option_a,
-            option_b=q.option_b,
-            option_c=q.option_c,
-            option_d=q.option_d,
-            correct_answer=q.correct_answer,
-            explanation=q.explanation,
-            difficulty=q.difficulty,
-            source="gpt",
-        )
-        db.add(question)
-        saved_questions.append(question)
-
-    await db.flush()
-
     # Create study session
-    session = StudySession(
-        user_id=current_user.user_id,
+    session = await insert_session(
+        db,
+        user_id=user_id,
         topic_id=topic.topic_id,
         difficulty=request.difficulty,
         question_count=len(saved_questions),
-        status="active",
     )
-    db.add(session)
-
+    await record_session_start(db, user_id)
     await db.commit()
-    await db.refresh(session)
-
-    for q in saved_questions:
-        await db.refresh(q)
 
     return SessionCreateResponse(
         session_id=session.session_id,
@@ -112,6 +128,325 @@ async def create_session(
     )
 
 
+async def insert_session(
+    db: AsyncSession,
+    user_id: int,
+    topic_id: int,
+    difficulty: str,
+    question_count: int,
+) -> StudySession:
+    """Insert an active session with RETURNING, so started_at needs no refresh."""
+    return await db.scalar(
+        insert(StudySession)
+        .values(
+            user_id=user_id,
+            topic_id=topic_id,
+            difficulty=difficulty,
+            question_count=question_count,
+            status="active",
+        )
+        .returning(StudySession)
+    )
+
+
+async def advance_session(
+    db: AsyncSession,
+    session_id: UUID,
+    user_id: int,
+    attempted: int,
+    correct: int,
+) -> Optional[Tuple[int, int]]:
+    """Add to an active session's counters in one atomic UPDATE.
+
+    Returns the new (questions_attempted, correct_answers), or None when the
+    session is not the user's or is no longer active.
+    """
+    result = await db.execute(
+        update(StudySession)
+        .where(
+            StudySession.session_id == session_id,
+            StudySession.user_id == user_id,
+            StudySession.status == "active",
+        )
+        .values(
+            questions_attempted=StudySession.questions_attempted + attempted,
+            correct_answers=StudySession.correct_answers + correct,
+        )
+        .returning(StudySession.questions_attempted, StudySession.correct_answers)
+    )
+    return result.one_or_none()
+
+
+async def session_not_active(db: AsyncSession, session_id: UUID, user_id: int) -> HTTPException:
+    """The error for an answer to a session that advance_session rejected."""
+    found = await db.scalar(
+        select(StudySession.session_id).where(
+            StudySession.session_id == session_id,
+            StudySession.user_id == user_id,
+        )
+    )
+    if found is None:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found",
+        )
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Session is already ended",
+    )
+
+
+def sse_event(event: str, data: BaseModel) -> str:
+    """Format a Server-Sent Events message."""
+    return f"event: {event}\ndata: {data.model_dump_json()}\n\n"
+
+
+@router.post("/sessions/stream")
+async def create_session_stream(
+    request: SessionCreateRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """학습 세션 시작 (SSE 스트리밍)
+
+    Events: ``session`` once, ``question`` per question as soon as it is
+    available, then ``done`` (or ``error`` if generation fails).
+    """
+    # Get topic
+    result = await db.execute(
+        select(Topic).where(Topic.topic_id == request.topic_id)
+    )
+    topic = result.scalar_one_or_none()
+
+    if not topic:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Topic not found",
+        )
+
+    return StreamingResponse(
+        stream_session(request, topic, current_user.user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def stream_session(
+    request: SessionCreateRequest,
+    topic: Topic,
+    user_id: int,
+) -> AsyncIterator[str]:
+    # The request-scoped session is closed before the body is streamed
+    async with async_session_maker() as db:
+        questions = await question_inventory.take(
+            db,
+            topic=topic,
+            difficulty=request.difficulty,
+            count=request.question_count,
+            user_id=user_id,
+        )
+
+        session = await insert_session(
+            db,
+            user_id=user_id,
+            topic_id=topic.topic_id,
+            difficulty=request.difficulty,
+            question_count=request.question_count,
+        )
+        await record_session_start(db, user_id)
+        await db.commit()
+
+        yield sse_event("session", SessionStreamStartResponse(
+            session_id=session.session_id,
+            topic=TopicResponse.model_validate(topic),
+            difficulty=request.difficulty,
+            question_count=request.question_count,
+            started_at=session.started_at,
+        ))
+
+        # A client disconnect cancels the generator at any yield; the finally
+        # still stores how many questions were actually sent
+        question_count = 0
+        try:
+            for q in questions:
+                question_count += 1
+                yield sse_event("question", SessionQuestionResponse.model_validate(q))
+
+            # Stream the shortfall, committing each question so it can be answered right away
+            sent_ids = [q.question_id for q in questions]
+            error = None
+            if question_count < request.question_count:
+                try:
+                    async for generated in openai_service.stream_questions(
+                        topic_name=topic.name,
+                        difficulty=request.difficulty,
+                        count=request.question_count - question_count,
+                    ):
+                        accepted = dedup_index.filter_new([generated])
+                        if not accepted:
+                            continue
+                        [question] = await insert_questions(db, topic.topic_id, [generated])
+                        await db.commit()
+                        dedup_index.add(question.question_id, accepted[0][1])
+                        sent_ids.append(question.question_id)
+                        question_count += 1
+                        yield sse_event("question", SessionQuestionResponse.model_validate(question))
+                except ValueError as e:
+                    error = e
+
+            if question_count < request.question_count:
+                # Provider down, truncated output or rejected duplicates: top up from the bank
+                fallback = await question_inventory.fallback(
+                    db,
+                    topic,
+                    request.difficulty,
+                    request.question_count - question_count,
+                    exclude_ids=sent_ids,
+                )
+                for question in fallback:
+                    question_count += 1
+                    yield sse_event("question", SessionQuestionResponse.model_validate(question))
+                if not fallback and error is not None:
+                    yield sse_event("error", MessageResponse(message=str(error)))
+        finally:
+            await asyncio.shield(finish_streamed_session(session.session_id, question_count))
+
+        yield sse_event("done", SessionStreamDoneResponse(
+            session_id=session.session_id,
+            question_count=question_count,
+        ))
+
+
+async def finish_streamed_session(session_id: UUID, question_count: int) -> None:
+    """Store the number of questions a streamed session sent; abandon it if none were."""
+    values = {"question_count": question_count}
+    if question_count == 0:
+        values["status"] = "abandoned"
+    # A fresh session: the stream's own one may be mid-statement when it is cancelled
+    async with async_session_maker() as db:
+        await db.execute(
+            update(StudySession).where(StudySession.session_id == session_id).values(**values)
+        )
+        await db.commit()
+
+
+@router.post("/sessions/{session_id}/answers", response_model=SessionAnswersResponse)
+async def submit_session_answers(
+    session_id: UUID,
+    request: SessionAnswersRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """세션 답안 일괄 제출"""
+    user_id = current_user.user_id
+    question_ids = [a.question_id for a in request.answers]
+    if len(set(question_ids)) != len(question_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each question may be answered once per submission",
+        )
+
+    # One read for every answer key, then grade in memory
+    result = await db.execute(
+        select(
+            Question.question_id,
+            Question.topic_id,
+            Question.correct_answer,
+            Question.explanation,
+        ).where(Question.question_id.in_(question_ids))
+    )
+    questions = {row.question_id: row for row in result}
+    missing = [qid for qid in question_ids if qid not in questions]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Questions not found: {missing}",
+        )
+
+    rows = []
+    results = []
+    by_topic = {}
+    for answer in request.answers:
+        question = questions[answer.question_id]
+        user_answer = answer.user_answer.lower()
+        is_correct = user_answer == question.correct_answer.lower()
+        rows.append({
+            "user_id": user_id,
+            "question_id": answer.question_id,
+            "session_id": session_id,
+            "user_answer": user_answer,
+            "is_correct": is_correct,
+            "time_spent_seconds": answer.time_spent_seconds,
+        })
+        results.append(AnswerSubmitResponse(
+            is_correct=is_correct,
+            correct_answer=question.correct_answer,
+            user_answer=user_answer,
+            explanation=question.explanation,
+            question_id=answer.question_id,
+        ))
+        answers, correct, seconds = by_topic.get(question.topic_id, (0, 0, 0))
+        by_topic[question.topic_id] = (
+            answers + 1,
+            correct + int(is_correct),
+            seconds + (answer.time_spent_seconds or 0),
+        )
+    wrong_ids = [r.question_id for r in results if not r.is_correct]
+    correct_count = len(results) - len(wrong_ids)
+
+    # Set-based writes: a fixed number of statements whatever the batch size.
+    # Rows are locked in the same order as write_answer (questions, mistake
+    # notes, user stats, session last) so a concurrent single submit to the
+    # same session cannot deadlock with this batch
+    await db.execute(
+        update(Question)
+        .where(Question.question_id.in_(question_ids))
+        .values(used_count=Question.used_count + 1)
+    )
+    try:
+        await db.execute(insert(UserAnswer), rows)
+    except IntegrityError:
+        # Unknown session_id; ownership and status are checked by advance_session below
+        await db.rollback()
+        raise await session_not_active(db, session_id, user_id)
+
+    new_mistakes = 0
+    if wrong_ids:
+        stmt = pg_insert(MistakeNote).values([
+            {"user_id": user_id, "question_id": qid} for qid in wrong_ids
+        ])
+        inserted = await db.scalars(
+            stmt.on_conflict_do_update(
+                constraint="uq_user_question",
+                set_={
+                    "mistake_count": MistakeNote.mistake_count + 1,
+                    "last_mistake_at": func.now(),
+                },
+            )
+            # xmax is 0 only for rows this statement inserted
+            .returning(literal_column("xmax = 0"))
+        )
+        new_mistakes = sum(inserted.all())
+
+    await record_answers(db, user_id, by_topic, new_mistakes=new_mistakes)
+
+    # The counter update doubles as the ownership and status check
+    counters = await advance_session(db, session_id, user_id, len(results), correct_count)
+    if counters is None:
+        await db.rollback()
+        raise await session_not_active(db, session_id, user_id)
+    await db.commit()
+
+    attempted, correct = counters
+    return SessionAnswersResponse(
+        session_id=session_id,
+        results=results,
+        questions_attempted=attempted,
+        correct_answers=correct,
+        accuracy_rate=Decimal(correct / attempted * 100) if attempted > 0 else None,
+    )
+
+
 @router.put("/sessions/{session_id}", response_model=SessionResultResponse)
 async def end_session(
     session_id: UUID,
@@ -119,12 +454,14 @@ async def end_session(
     current_user: User = Depends(get_current_user),
 ):
     """학습 세션 종료"""
-    # Get session
+    # Lock the row so in-flight answers land before or are rejected after
     result = await db.execute(
-        select(StudySession).where(
+        select(StudySession)
+        .where(
             StudySession.session_id == session_id,
             StudySession.user_id == current_user.user_id,
         )
+        .with_for_update()
     )
     session = result.scalar_one_or_none()
 
@@ -140,26 +477,18 @@ async def end_session(
             detail="Session is already ended",
         )
 
-    # Calculate session stats
-    result = await db.execute(
-        select(
-            func.count(UserAnswer.answer_id).label("attempted"),
-            func.sum(func.cast(UserAnswer.is_correct, Integer)).label("correct"),
-        ).where(UserAnswer.session_id == session_id)
-    )
-    stats = result.first()
-
-    attempted = stats.attempted or 0
-    correct = stats.correct or 0
+    # Counters are kept current by every answer to the session
+    attempted = session.questions_attempted
+    correct = session.correct_answers
 
     # Update session
     session.status = "completed"
     session.ended_at = datetime.utcnow()
     session.duration_seconds = int((session.ended_at - session.started_at).total_seconds())
-    session.questions_attempted = attempted
-    session.correct_answers = correct
     session.accuracy_rate = Decimal(correct / attempted * 100) if attempted > 0 else None
 
+    await record_session_end(db, current_user.user_id, session.duration_seconds, attempted, correct)
+
     await db.commit()
     await db.refresh(session)
 
@@ -174,23 +503,69 @@ async def end_session(
     )
 
 
+@router.get("/sessions/{session_id}", response_model=SessionResponse)
+async def get_session(
+    session_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """학습 세션 조회 (진행 상황)"""
+    result = await db.execute(
+        select(StudySession, Topic)
+        .outerjoin(Topic, StudySession.topic_id == Topic.topic_id)
+        .where(
+            StudySession.session_id == session_id,
+            StudySession.user_id == current_user.user_id,
+        )
+    )
+    row = result.first()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found",
+        )
+
+    session, topic = row
+    return SessionResponse(
+        session_id=session.session_id,
+        topic_id=session.topic_id,
+        topic_name=topic.name if topic else None,
+        difficulty=session.difficulty,
+        question_count=session.question_count,
+        status=session.status,
+        started_at=session.started_at,
+        ended_at=session.ended_at,
+        duration_seconds=session.duration_seconds,
+        questions_attempted=session.questions_attempted,
+        correct_answers=session.correct_answers,
+        accuracy_rate=session.accuracy_rate,
+    )
+
+
 @router.get("/sessions", response_model=SessionListResponse)
 async def get_sessions(
     limit: int = Query(default=10, ge=1, le=50),
-    offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """학습 세션 목록 조회"""
     result = await db.execute(
-        select(StudySession, Topic)
-        .outerjoin(Topic, StudySession.topic_id == Topic.topic_id)
-        .where(StudySession.user_id == current_user.user_id)
-        .order_by(StudySession.started_at.desc())
-        .limit(limit)
-        .offset(offset)
+        keyset_page(
+            select(StudySession, Topic)
+            .outerjoin(Topic, StudySession.topic_id == Topic.topic_id)
+            .where(StudySession.user_id == current_user.user_id),
+            StudySession.started_at,
+            StudySession.session_id,
+            cursor,
+            limit,
+            UUID,
+        )
+    )
+    rows, next_cursor = split_page(
+        result.all(), limit, lambda row: (row[0].started_at, row[0].session_id)
     )
-    rows = result.all()
 
     sessions = []
     for session, topic in rows:
@@ -209,16 +584,19 @@ async def get_sessions(
             accuracy_rate=session.accuracy_rate,
         ))
 
+    stats = await load_user_stats(db, current_user.user_id)
     return SessionListResponse(
         sessions=sessions,
         count=len(sessions),
+        total=stats.sessions_started,
+        next_cursor=next_cursor,
     )
 
 
 @router.get("/mistakes", response_model=MistakeListResponse)
 async def get_mistakes(
     limit: int = Query(default=20, ge=1, le=100),
-    offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None),
     mastered: Optional[bool] = Query(default=None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -234,10 +612,14 @@ async def get_mistakes(
     if mastered is not None:
         query = query.where(MistakeNote.mastered == mastered)
 
-    query = query.order_by(MistakeNote.last_mistake_at.desc()).limit(limit).offset(offset)
-
-    result = await db.execute(query)
-    rows = result.all()
+    # Paged on when each note was opened: last_mistake_at moves when a
+    # mistake recurs, which would skip or repeat notes mid-scroll
+    result = await db.execute(
+        keyset_page(query, MistakeNote.first_mistake_at, MistakeNote.note_id, cursor, limit, int)
+    )
+    rows, next_cursor = split_page(
+        result.all(), limit, lambda row: (row[0].first_mistake_at, row[0].note_id)
+    )
 
     mistakes = []
     for note, question, topic in rows:
@@ -265,31 +647,49 @@ async def get_mistakes(
             mastered=note.mastered,
         ))
 
+    stats = await load_user_stats(db, current_user.user_id)
+    if mastered is None:
+        total = stats.total_mistakes
+    elif mastered:
+        total = max(stats.total_mistakes - stats.open_mistakes, 0)
+    else:
+        total = stats.open_mistakes
+
     return MistakeListResponse(
         mistakes=mistakes,
         count=len(mistakes),
+        total=total,
+        next_cursor=next_cursor,
     )
 
 
 @router.get("/history", response_model=StudyHistoryResponse)
 async def get_history(
     limit: int = Query(default=10, ge=1, le=50),
+    cursor: Optional[str] = Query(default=None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """학습 기록 조회"""
-    # Get recent sessions
+    # Completed sessions, most recently ended first
     result = await db.execute(
-        select(StudySession, Topic)
-        .outerjoin(Topic, StudySession.topic_id == Topic.topic_id)
-        .where(
-            StudySession.user_id == current_user.user_id,
-            StudySession.status == "completed",
+        keyset_page(
+            select(StudySession, Topic)
+            .outerjoin(Topic, StudySession.topic_id == Topic.topic_id)
+            .where(
+                StudySession.user_id == current_user.user_id,
+                StudySession.status == "completed",
+            ),
+            StudySession.ended_at,
+            StudySession.session_id,
+            cursor,
+            limit,
+            UUID,
         )
-        .order_by(StudySession.ended_at.desc())
-        .limit(limit)
     )
-    rows = result.all()
+    rows, next_cursor = split_page(
+        result.all(), limit, lambda row: (row[0].ended_at, row[0].session_id)
+    )
 
     sessions = []
     for session, topic in rows:
@@ -308,28 +708,23 @@ async def get_history(
             accuracy_rate=session.accuracy_rate,
         ))
 
-    # Get overall stats
-    result = await db.execute(
-        select(
-            func.count(StudySession.session_id).label("total_sessions"),
-            func.sum(StudySession.questions_attempted).label("total_questions"),
-            func.sum(StudySession.correct_answers).label("total_correct"),
-        ).where(
-            StudySession.user_id == current_user.user_id,
-            StudySession.status == "completed",
-        )
-    )
-    stats = result.first()
-
-    total_sessions = stats.total_sessions or 0
-    total_questions = stats.total_questions or 0
-    total_correct = stats.total_correct or 0
+    # Totals over completed sessions, kept by end_session
+    stats = await load_user_stats(db, current_user.user_id)
+    total_questions = stats.session_questions
+    total_correct = stats.session_correct
     overall_accuracy = Decimal(total_correct / total_questions * 100) if total_questions > 0 else None
 
     return StudyHistoryResponse(
         sessions=sessions,
-        total_sessions=total_sessions,
+        total_sessions=stats.total_sessions,
         total_questions=total_questions,
         total_correct=total_correct,
         overall_accuracy=overall_accuracy,
+        next_cursor=next_cursor,
     )
+
+
+async def load_user_stats(db: AsyncSession, user_id: int) -> UserStats:
+    """The user's counters, or zeros for a user who has not studied yet."""
+    stats = await db.get(UserStats, user_id)
+    return stats if stats is not None else UserStats(user_id=user_id, **EMPTY_STATS)
@@ -0,0 +1,75 @@
+"""Maintenance commands.
+
+    python -m app.cli rebuild-user-stats [--user-id ID ...] [--batch-size N]
+    python -m app.cli rebuild-daily-stats [--user-id ID ...] [--batch-size N]
+"""
+import argparse
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session_maker, engine
+from app.models import User
+from app.services.user_stats import rebuild_daily_stats, rebuild_user_stats
+
+Rebuild = Callable[[AsyncSession, Sequence[int]], Awaitable[int]]
+
+
+async def rebuild_in_batches(
+    rebuild: Rebuild,
+    label: str,
+    user_ids: Optional[List[int]],
+    batch_size: int,
+) -> None:
+    """Run ``rebuild`` over the given users or all users, one committed batch at a time."""
+    if user_ids:
+        async with async_session_maker() as db:
+            written = await rebuild(db, user_ids)
+            await db.commit()
+        print(f"Rebuilt {written} {label} rows for {len(user_ids)} users")
+        return
+
+    last_user_id = 0
+    total = 0
+    while True:
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(User.user_id)
+                .where(User.user_id > last_user_id)
+                .order_by(User.user_id)
+                .limit(batch_size)
+            )
+            batch = list(result.scalars().all())
+            if not batch:
+                break
+            total += await rebuild(db, batch)
+            await db.commit()
+        last_user_id = batch[-1]
+        print(f"Rebuilt {total} {label} rows (up to user_id {last_user_id})")
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuilds = {
+        "rebuild-user-stats": (rebuild_user_stats, "user_stats", "backfill or repair user_stats"),
+        "rebuild-daily-stats": (rebuild_daily_stats, "user_daily_stats", "backfill or repair user_daily_stats"),
+    }
+    for name, (_, _, help_text) in rebuilds.items():
+        rebuild = commands.add_parser(name, help=help_text)
+        rebuild.add_argument("--user-id", type=int, action="append", dest="user_ids")
+        rebuild.add_argument("--batch-size", type=int, default=500)
+
+    args = parser.parse_args(argv)
+    try:
+        rebuild, label, _ = rebuilds[args.command]
+        await rebuild_in_batches(rebuild, label, args.user_ids, args.batch_size)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,8 +16,104 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
 
+    # Auth cache: verified token -> user, per worker. Deactivation and deletion
+    # through the ORM evict at once; other changes show after at most the TTL
+    AUTH_CACHE_TTL_SECONDS: int = 30  # 0 disables the cache
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # Password hashing: bcrypt runs in a dedicated thread pool per worker.
+    # Hashes with another cost are rehashed on the next successful login
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_THREADS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16  # running + queued; beyond this 503
+
+    # Accounts allowed to read /api/monitoring (JSON list of emails; empty: nobody)
+    ADMIN_EMAILS: str = '[]'
+
+    # LLM provider: "openai", "stub" (local HTTP stub at LLM_STUB_URL) or "fake" (in-process)
+    LLM_PROVIDER: str = "openai"
+    LLM_STUB_URL: str = "http://localhost:8100/v1"
+    # Simulated timing for the fake provider and the stub server (python -m app.llm_stub)
+    LLM_FAKE_LATENCY_SECONDS: float = 1.0  # time to first token
+    LLM_FAKE_TOKENS_PER_SECOND: float = 80.0
+    LLM_FAKE_SEED: int = 0
+
     # OpenAI API
     OPENAI_API_KEY: str = ""
+    OPENAI_MODEL: str = "gpt-4o"
+    OPENAI_TIMEOUT_SECONDS: float = 60.0
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENAI_MAX_RETRIES: int = 2  # retries of transient errors, with jittered backoff
+    OPENAI_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    OPENAI_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    OPENAI_MAX_CONNECTIONS: int = 20
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    OPENAI_MAX_CONCURRENT_REQUESTS: int = 8  # in-flight calls per worker
+    OPENAI_MAX_TOKENS: int = 4096
+    OPENAI_TOKENS_PER_QUESTION: int = 450  # completion budget per requested question
+    OPENAI_FANOUT_CHUNK_SIZE: int = 5  # questions per completion
+    OPENAI_FANOUT_CONCURRENCY: int = 4  # concurrent completions per request
+
+    # LLM rate limits (per worker process)
+    LLM_REQUESTS_PER_MINUTE: int = 500
+    LLM_TOKENS_PER_MINUTE: int = 30000
+
+    # LLM cost accounting (USD per 1K tokens, for /api/monitoring/llm)
+    LLM_PROMPT_PRICE_PER_1K: float = 0.005
+    LLM_COMPLETION_PRICE_PER_1K: float = 0.015
+
+    # LLM circuit breaker
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive failed calls before opening
+    LLM_BREAKER_RESET_SECONDS: float = 30.0  # open time before a trial call is let through
+
+    # LLM response cache (meant for dev and benchmarks; generation is non-deterministic)
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_OFFLINE: bool = False  # serve only from the cache, never call the API
+    LLM_CACHE_MAX_ENTRIES: int = 1000
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # 0 = never expire
+    LLM_CACHE_DIR: str = ".llm_cache"  # empty = memory tier only
+    LLM_CACHE_DISK_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # Question inventory
+    # Off by default: the first pass generates every topic/difficulty bucket
+    INVENTORY_REFILL_ENABLED: bool = False
+    INVENTORY_LOW_WATER_MARK: int = 30
+    INVENTORY_HIGH_WATER_MARK: int = 60
+    INVENTORY_REFILL_BATCH_SIZE: int = 10
+    INVENTORY_REFILL_INTERVAL_SECONDS: int = 60
+    INVENTORY_MAX_USES: int = 50  # questions answered this often no longer count as stock
+
+    # Near-duplicate detection (MinHash/LSH over character shingles)
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.8  # estimated Jaccard similarity
+    DEDUP_NUM_PERM: int = 32
+    DEDUP_BANDS: int = 8
+    DEDUP_SHINGLE_SIZE: int = 3
+    DEDUP_SYNC_INTERVAL_SECONDS: int = 60
+    DEDUP_SYNC_OVERLAP_IDS: int = 1000  # re-read behind the watermark for late commits
+
+    # Generation jobs (run by `python -m app.worker`)
+    JOB_TIMEOUT_SECONDS: int = 300  # a running job older than this is reclaimed
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    WORKER_CONCURRENCY: int = 4
+
+    # Answer ingestion: "direct" commits every answer; "buffered" acknowledges
+    # once the answer is fsynced to a local write-ahead log and writes to
+    # Postgres in batches (replayed from the log after a crash)
+    ANSWER_INGEST_MODE: str = "direct"
+    ANSWER_BUFFER_DIR: str = ".answer_wal"
+    ANSWER_BUFFER_BATCH_SIZE: int = 500  # flush when this many answers are pending
+    ANSWER_BUFFER_FLUSH_INTERVAL_SECONDS: float = 0.5
+    ANSWER_BUFFER_MAX_PENDING: int = 50000  # unflushed answers; beyond this 503
+    ANSWER_BUFFER_KEY_CACHE_SIZE: int = 10000  # answer keys kept for grading
+
+    # Dashboard statistics
+    # Day boundaries when the client sends no tz, and of user_daily_stats
+    # (run rebuild-daily-stats after changing it)
+    DEFAULT_TIMEZONE: str = "Asia/Seoul"
+    STATS_MAX_RANGE_DAYS: int = 366
 
     # CORS
     CORS_ORIGINS: str = '["http://localhost:3000","http://localhost:5173"]'
@@ -26,6 +122,10 @@ class Settings(BaseSettings):
     def cors_origins_list(self) -> List[str]:
         return json.loads(self.CORS_ORIGINS)
 
+    @property
+    def admin_emails_list(self) -> List[str]:
+        return [email.lower() for email in json.loads(self.ADMIN_EMAILS)]
+
     class Config:
         env_file = ".env"
         case_sensitive = True
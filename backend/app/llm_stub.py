@@ -0,0 +1,103 @@
+"""Local stand-in for the OpenAI chat completions API.
+
+Serves deterministic questions with the latency and token rate set by
+``LLM_FAKE_*`` so the backend can be load-tested without an API key:
+
+    python -m app.llm_stub            # listens on :8100
+    LLM_PROVIDER=stub uvicorn app.main:app
+"""
+import json
+import time
+import uuid
+from typing import AsyncIterator, List, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.services.fake_llm import FakeProvider
+
+
+class ChatCompletionRequest(BaseModel):
+    model: str
+    messages: List[dict]
+    max_tokens: int = 4096
+    temperature: float = 1.0
+    stream: bool = False
+    stream_options: Optional[dict] = None
+
+
+app = FastAPI(title="LLM stub", docs_url=None, redoc_url=None)
+
+provider = FakeProvider(
+    model=settings.OPENAI_MODEL,
+    latency_seconds=settings.LLM_FAKE_LATENCY_SECONDS,
+    tokens_per_second=settings.LLM_FAKE_TOKENS_PER_SECOND,
+    seed=settings.LLM_FAKE_SEED,
+)
+
+
+def usage(prompt_tokens: int, completion_tokens: int) -> dict:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: ChatCompletionRequest):
+    completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+
+    if not request.stream:
+        completion = await provider.complete(
+            request.messages, request.max_tokens, request.temperature
+        )
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": request.model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": completion.content},
+                "finish_reason": "length"
+                if completion.completion_tokens >= request.max_tokens else "stop",
+            }],
+            "usage": usage(completion.prompt_tokens, completion.completion_tokens),
+        }
+
+    events = await provider.open_stream(request.messages, request.max_tokens, request.temperature)
+    include_usage = bool((request.stream_options or {}).get("include_usage"))
+
+    async def body() -> AsyncIterator[str]:
+        def chunk(choices: list, **extra) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": request.model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        async for event in events:
+            if event.text:
+                yield chunk([{"index": 0, "delta": {"content": event.text}, "finish_reason": None}])
+            elif event.completion_tokens is not None:
+                finish = "length" if event.completion_tokens >= request.max_tokens else "stop"
+                yield chunk([{"index": 0, "delta": {}, "finish_reason": finish}])
+                if include_usage:
+                    yield chunk([], usage=usage(event.prompt_tokens or 0, event.completion_tokens))
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(body(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8100)
@@ -1,13 +1,45 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.api import auth_router, questions_router, study_router, dashboard_router
+from app.core.security import password_hasher
+from app.api import (
+    auth_router,
+    questions_router,
+    study_router,
+    dashboard_router,
+    jobs_router,
+    monitoring_router,
+)
+from app.services import openai_service, question_inventory, dedup_index
+from app.services.answer_buffer import answer_buffer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the near-duplicate index in the background; it is usable while loading
+    dedup_index.start()
+    if settings.INVENTORY_REFILL_ENABLED:
+        question_inventory.start()
+    # Replays answers left in the log by a crashed worker before accepting new ones
+    if settings.ANSWER_INGEST_MODE == "buffered":
+        await answer_buffer.start()
+    yield
+    await answer_buffer.stop()
+    await question_inventory.stop()
+    await dedup_index.stop()
+    # Release pooled connections to the OpenAI API
+    await openai_service.close()
+    password_hasher.close()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     description="AICE Associate 자격증 수험생을 위한 AI 기반 학습 플랫폼",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -39,3 +71,5 @@ app.include_router(auth_router)
 app.include_router(questions_router)
 app.include_router(study_router)
 app.include_router(dashboard_router)
+app.include_router(jobs_router)
+app.include_router(monitoring_router)
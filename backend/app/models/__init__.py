@@ -1,6 +1,8 @@
 from app.models.user import User
 from app.models.question import Topic, Question
 from app.models.study import StudySession, UserAnswer, MistakeNote
+from app.models.job import GenerationJob
+from app.models.stats import UserStats, UserDailyStats
 
 __all__ = [
     "User",
@@ -9,4 +11,7 @@ __all__ = [
     "StudySession",
     "UserAnswer",
     "MistakeNote",
+    "GenerationJob",
+    "UserStats",
+    "UserDailyStats",
 ]
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from sqlalchemy import String, DateTime, Integer, Text, ForeignKey, CheckConstraint, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.user_id", ondelete="CASCADE"), index=True)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default="pending")
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    result: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("kind IN ('questions', 'session')", name="check_job_kind"),
+        CheckConstraint(
+            "status IN ('pending', 'running', 'completed', 'failed')",
+            name="check_job_status",
+        ),
+        Index(
+            "idx_jobs_queue",
+            "created_at",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
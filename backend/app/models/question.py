@@ -2,7 +2,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional, List
 
-from sqlalchemy import String, Boolean, DateTime, Integer, Text, ForeignKey, CheckConstraint, Numeric, func
+from sqlalchemy import String, Boolean, DateTime, Integer, Text, ForeignKey, CheckConstraint, Numeric, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -45,6 +45,11 @@ class Question(Base):
     __table_args__ = (
         CheckConstraint("correct_answer IN ('a', 'b', 'c', 'd')", name="check_correct_answer"),
         CheckConstraint("difficulty IN ('easy', 'medium', 'hard')", name="check_difficulty"),
+        Index(
+            "idx_questions_inventory",
+            "topic_id", "difficulty", "used_count",
+            postgresql_where=text("is_active"),
+        ),
     )
 
     # Relationships
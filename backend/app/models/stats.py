@@ -0,0 +1,56 @@
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, Integer, BigInteger, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class UserStats(Base):
+    """Per-user dashboard totals, kept current by the answer and session endpoints."""
+
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    total_questions: Mapped[int] = mapped_column(Integer, default=0)
+    total_correct: Mapped[int] = mapped_column(Integer, default=0)
+    total_sessions: Mapped[int] = mapped_column(Integer, default=0)
+    total_study_time_seconds: Mapped[int] = mapped_column(BigInteger, default=0)
+    open_mistakes: Mapped[int] = mapped_column(Integer, default=0)
+    total_mistakes: Mapped[int] = mapped_column(Integer, default=0)
+    sessions_started: Mapped[int] = mapped_column(Integer, default=0)
+    # Answers counted in completed sessions, as of their completion
+    session_questions: Mapped[int] = mapped_column(Integer, default=0)
+    session_correct: Mapped[int] = mapped_column(Integer, default=0)
+    current_streak: Mapped[int] = mapped_column(Integer, default=0)
+    last_study_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class UserDailyStats(Base):
+    """Answers per user, topic and local day (``DEFAULT_TIMEZONE``), kept current on each answer."""
+
+    __tablename__ = "user_daily_stats"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.user_id", ondelete="CASCADE"))
+    topic_id: Mapped[Optional[int]] = mapped_column(ForeignKey("topics.topic_id"), nullable=True)
+    local_date: Mapped[date] = mapped_column(Date)
+    answers: Mapped[int] = mapped_column(Integer, default=0)
+    correct: Mapped[int] = mapped_column(Integer, default=0)
+    time_spent_seconds: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    __table_args__ = (
+        # Questions without a topic share one row per day (PostgreSQL 15+)
+        Index(
+            "uq_daily_stats_user_topic_date",
+            "user_id", "topic_id", "local_date",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("idx_daily_stats_user_date", "user_id", "local_date"),
+    )
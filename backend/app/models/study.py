@@ -3,7 +3,7 @@ from decimal import Decimal
 from typing import Optional, List
 import uuid
 
-from sqlalchemy import String, Boolean, DateTime, Integer, ForeignKey, CheckConstraint, Numeric, func, UniqueConstraint
+from sqlalchemy import String, Boolean, DateTime, Integer, ForeignKey, CheckConstraint, Numeric, func, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -32,6 +32,9 @@ class StudySession(Base):
 
     __table_args__ = (
         CheckConstraint("status IN ('active', 'completed', 'abandoned')", name="check_session_status"),
+        # Keyset pagination of the session list and the completed history
+        Index("idx_sessions_user_started", "user_id", "started_at", "session_id"),
+        Index("idx_sessions_user_status_ended", "user_id", "status", "ended_at", "session_id"),
     )
 
     # Relationships
@@ -56,9 +59,14 @@ class UserAnswer(Base):
     is_correct: Mapped[bool] = mapped_column(Boolean, nullable=False)
     time_spent_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     answered_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    # Set by the buffered ingest path so replaying its log never duplicates answers
+    ingest_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
 
     __table_args__ = (
         CheckConstraint("user_answer IN ('a', 'b', 'c', 'd')", name="check_user_answer"),
+        Index("idx_answers_user_question", "user_id", "question_id"),
+        Index("idx_answers_user_answered", "user_id", "answered_at"),
+        Index("uq_answers_ingest_id", "ingest_id", unique=True),
     )
 
     # Relationships
@@ -83,6 +91,9 @@ class MistakeNote(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "question_id", name="uq_user_question"),
+        # Keyset pagination of the mistake list, with and without ?mastered=
+        Index("idx_mistakes_user_first", "user_id", "first_mistake_at", "note_id"),
+        Index("idx_mistakes_user_mastered_first", "user_id", "mastered", "first_mistake_at", "note_id"),
     )
 
     # Relationships
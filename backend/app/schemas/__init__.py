@@ -22,19 +22,35 @@ from app.schemas.study import (
     SessionCreateRequest,
     SessionCreateResponse,
     SessionQuestionResponse,
+    SessionStreamStartResponse,
+    SessionStreamDoneResponse,
     SessionResponse,
     SessionResultResponse,
     SessionListResponse,
+    SessionAnswerItem,
+    SessionAnswersRequest,
+    SessionAnswersResponse,
     MistakeNoteResponse,
     MistakeListResponse,
     StudyHistoryResponse,
 )
+from app.schemas.job import JobResponse
+from app.schemas.monitoring import (
+    LLMMonitoringResponse,
+    AuthMonitoringResponse,
+    IngestMonitoringResponse,
+)
 from app.schemas.dashboard import (
     DashboardSummaryResponse,
     TopicStatResponse,
     TopicStatsResponse,
     DailyStatResponse,
+    DailyStatsResponse,
     WeeklyStatsResponse,
+    MonthlyStatResponse,
+    MonthlyStatsResponse,
+    HeatmapDayResponse,
+    HeatmapResponse,
 )
 
 __all__ = [
@@ -57,15 +73,29 @@ __all__ = [
     "SessionCreateRequest",
     "SessionCreateResponse",
     "SessionQuestionResponse",
+    "SessionStreamStartResponse",
+    "SessionStreamDoneResponse",
     "SessionResponse",
     "SessionResultResponse",
     "SessionListResponse",
+    "SessionAnswerItem",
+    "SessionAnswersRequest",
+    "SessionAnswersResponse",
     "MistakeNoteResponse",
     "MistakeListResponse",
     "StudyHistoryResponse",
+    "JobResponse",
+    "LLMMonitoringResponse",
+    "AuthMonitoringResponse",
+    "IngestMonitoringResponse",
     "DashboardSummaryResponse",
     "TopicStatResponse",
     "TopicStatsResponse",
     "DailyStatResponse",
+    "DailyStatsResponse",
     "WeeklyStatsResponse",
+    "MonthlyStatResponse",
+    "MonthlyStatsResponse",
+    "HeatmapDayResponse",
+    "HeatmapResponse",
 ]
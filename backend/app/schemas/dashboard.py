@@ -31,12 +31,13 @@ class TopicStatsResponse(BaseModel):
     count: int
 
 
-# Weekly stats
+# Daily / weekly stats
 class DailyStatResponse(BaseModel):
     date: date
     questions_count: int
     correct_count: int
     accuracy_rate: Optional[Decimal] = None
+    time_spent_seconds: int = 0
 
 
 class WeeklyStatsResponse(BaseModel):
@@ -44,3 +45,46 @@ class WeeklyStatsResponse(BaseModel):
     total_questions: int
     total_correct: int
     average_accuracy: Optional[Decimal] = None
+
+
+class DailyStatsResponse(BaseModel):
+    date_from: date
+    date_to: date
+    timezone: str
+    daily_stats: List[DailyStatResponse]
+    total_questions: int
+    total_correct: int
+    average_accuracy: Optional[Decimal] = None
+
+
+# Monthly stats
+class MonthlyStatResponse(BaseModel):
+    month: date
+    questions_count: int
+    correct_count: int
+    accuracy_rate: Optional[Decimal] = None
+    time_spent_seconds: int = 0
+
+
+class MonthlyStatsResponse(BaseModel):
+    timezone: str
+    monthly_stats: List[MonthlyStatResponse]
+    total_questions: int
+    total_correct: int
+    average_accuracy: Optional[Decimal] = None
+
+
+# Activity heatmap (days with at least one answer)
+class HeatmapDayResponse(BaseModel):
+    date: date
+    questions_count: int
+    correct_count: int
+
+
+class HeatmapResponse(BaseModel):
+    date_from: date
+    date_to: date
+    timezone: str
+    days: List[HeatmapDayResponse]
+    active_days: int
+    max_count: int
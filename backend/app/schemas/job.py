@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+# Background generation job
+class JobResponse(BaseModel):
+    job_id: UUID
+    kind: str
+    status: str
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
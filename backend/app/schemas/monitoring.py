@@ -0,0 +1,23 @@
+from typing import Any, Dict
+
+from pydantic import BaseModel
+
+
+# LLM monitoring
+class LLMMonitoringResponse(BaseModel):
+    metrics: Dict[str, Any]
+    breaker: Dict[str, Any]
+    inventory: Dict[str, Any]
+    cache: Dict[str, Any]
+    dedup: Dict[str, Any]
+
+
+# Auth cache monitoring
+class AuthMonitoringResponse(BaseModel):
+    cache: Dict[str, Any]
+    password_hashing: Dict[str, Any]
+
+
+# Answer ingestion monitoring
+class IngestMonitoringResponse(BaseModel):
+    answer_buffer: Dict[str, Any]
@@ -1,6 +1,7 @@
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional, List
+from uuid import UUID
 
 from pydantic import BaseModel, Field
 
@@ -75,6 +76,7 @@ class QuestionGenerateResponse(BaseModel):
 class AnswerSubmitRequest(BaseModel):
     user_answer: str = Field(..., pattern="^[abcd]$")
     time_spent_seconds: Optional[int] = Field(default=None, ge=0)
+    session_id: Optional[UUID] = None
 
 
 class AnswerSubmitResponse(BaseModel):
@@ -83,6 +85,9 @@ class AnswerSubmitResponse(BaseModel):
     user_answer: str
     explanation: Optional[str] = None
     question_id: int
+    # Running counters of the session the answer was linked to
+    session_questions_attempted: Optional[int] = None
+    session_correct_answers: Optional[int] = None
 
 
 # Internal schema for Claude API response parsing
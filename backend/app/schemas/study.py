@@ -5,7 +5,11 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
-from app.schemas.question import TopicResponse, QuestionWithAnswerResponse
+from app.schemas.question import (
+    TopicResponse,
+    QuestionWithAnswerResponse,
+    AnswerSubmitResponse,
+)
 
 
 # Session request schemas
@@ -42,6 +46,20 @@ class SessionCreateResponse(BaseModel):
     started_at: datetime
 
 
+# Streaming session events
+class SessionStreamStartResponse(BaseModel):
+    session_id: UUID
+    topic: TopicResponse
+    difficulty: str
+    question_count: int
+    started_at: datetime
+
+
+class SessionStreamDoneResponse(BaseModel):
+    session_id: UUID
+    question_count: int
+
+
 class SessionResponse(BaseModel):
     session_id: UUID
     topic_id: Optional[int] = None
@@ -73,6 +91,27 @@ class SessionResultResponse(BaseModel):
 class SessionListResponse(BaseModel):
     sessions: List[SessionResponse]
     count: int
+    total: int
+    next_cursor: Optional[str] = None
+
+
+# Batch answer submission
+class SessionAnswerItem(BaseModel):
+    question_id: int
+    user_answer: str = Field(..., pattern="^[abcd]$")
+    time_spent_seconds: Optional[int] = Field(default=None, ge=0)
+
+
+class SessionAnswersRequest(BaseModel):
+    answers: List[SessionAnswerItem] = Field(..., min_length=1, max_length=100)
+
+
+class SessionAnswersResponse(BaseModel):
+    session_id: UUID
+    results: List[AnswerSubmitResponse]
+    questions_attempted: int
+    correct_answers: int
+    accuracy_rate: Optional[Decimal] = None
 
 
 # Mistake note schemas
@@ -93,6 +132,8 @@ class MistakeNoteResponse(BaseModel):
 class MistakeListResponse(BaseModel):
     mistakes: List[MistakeNoteResponse]
     count: int
+    total: int
+    next_cursor: Optional[str] = None
 
 
 # History schemas
@@ -102,3 +143,4 @@ class StudyHistoryResponse(BaseModel):
     total_questions: int
     total_correct: int
     overall_accuracy: Optional[Decimal] = None
+    next_cursor: Optional[str] = None
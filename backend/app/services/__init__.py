@@ -1,3 +1,15 @@
 from app.services.openai_service import openai_service, OpenAIService
+from app.services.question_inventory import question_inventory, QuestionInventory
+from app.services.dedup_index import dedup_index, NearDuplicateIndex
+from app.services.resilience import llm_breaker, CircuitBreaker
 
-__all__ = ["openai_service", "OpenAIService"]
+__all__ = [
+    "openai_service",
+    "OpenAIService",
+    "question_inventory",
+    "QuestionInventory",
+    "dedup_index",
+    "NearDuplicateIndex",
+    "llm_breaker",
+    "CircuitBreaker",
+]
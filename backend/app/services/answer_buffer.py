@@ -0,0 +1,593 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Integer, column, func, literal_column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models import Question, StudySession, UserAnswer, MistakeNote, UserStats, UserDailyStats
+
+
+logger = logging.getLogger(__name__)
+
+MAX_FLUSH_BACKOFF_SECONDS = 30.0
+
+
+@dataclass
+class AnswerKey:
+    topic_id: Optional[int]
+    correct_answer: str
+    explanation: Optional[str]
+
+
+@dataclass
+class BufferedAnswer:
+    ingest_id: str
+    user_id: int
+    question_id: int
+    topic_id: Optional[int]
+    session_id: Optional[str]
+    user_answer: str
+    is_correct: bool
+    time_spent_seconds: Optional[int]
+    answered_at: str  # naive UTC, ISO format
+
+
+def _daily_order(item) -> tuple:
+    """Sort key for daily rollup rows; a None topic sorts first."""
+    (user_id, topic_id, local_date), _ = item
+    return user_id, topic_id is not None, topic_id or 0, local_date
+
+
+class AnswerBufferFull(RuntimeError):
+    """Raised when too many answers are waiting to be written to Postgres."""
+
+
+class AnswerBuffer:
+    """Write-behind buffer for graded answers.
+
+    ``submit`` appends the answer to this worker's log segment and returns
+    once it is fsynced; appends that arrive during an fsync share the next
+    one. A flusher seals the segment every ``batch_size`` answers or
+    ``flush_interval`` seconds and writes it to Postgres in one transaction
+    of multi-row statements, then deletes it. Each answer carries an
+    ``ingest_id`` (unique in user_answers), so replaying a segment that was
+    partly written before a crash inserts and counts every answer once.
+
+    Segments are flock'ed by the worker writing them; ``start`` replays any
+    unlocked segment left behind by a worker that died.
+    """
+
+    def __init__(
+        self,
+        wal_dir: str,
+        batch_size: int,
+        flush_interval: float,
+        max_pending: int,
+        key_cache_size: int,
+    ):
+        self.wal_dir = Path(wal_dir)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.key_cache_size = key_cache_size
+
+        self._keys: "OrderedDict[int, AnswerKey]" = OrderedDict()
+        self._queue: List[Tuple[BufferedAnswer, asyncio.Future]] = []
+        self._pending: List[BufferedAnswer] = []
+        # (path, records, fd holding the segment's flock)
+        self._sealed: List[Tuple[Path, List[BufferedAnswer], int]] = []
+        self._segment: Optional[Path] = None
+        self._fd: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._flush_now = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._closing = False
+
+        self.acknowledged = 0
+        self.flushed = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.fsyncs = 0
+        self.rejected = 0
+        self.recovered = 0
+        self.flush_errors = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def accepting(self) -> bool:
+        """False while stopping or if the flusher died: nothing would reach Postgres."""
+        return self.running and not self._closing and not self._tasks[1].done()
+
+    def unflushed(self) -> int:
+        return len(self._queue) + len(self._pending) + sum(len(r) for _, r, _ in self._sealed)
+
+    # Grading
+
+    async def answer_key(self, db: AsyncSession, question_id: int) -> Optional[AnswerKey]:
+        """The question's answer key, from memory when possible."""
+        key = self._keys.get(question_id)
+        if key is not None:
+            self._keys.move_to_end(question_id)
+            return key
+
+        row = (await db.execute(
+            select(Question.topic_id, Question.correct_answer, Question.explanation)
+            .where(Question.question_id == question_id)
+        )).one_or_none()
+        if row is None:
+            return None
+        key = AnswerKey(*row)
+        self._keys[question_id] = key
+        while len(self._keys) > self.key_cache_size:
+            self._keys.popitem(last=False)
+        return key
+
+    # Durable enqueue
+
+    async def submit(
+        self,
+        user_id: int,
+        question_id: int,
+        key: AnswerKey,
+        user_answer: str,
+        is_correct: bool,
+        time_spent_seconds: Optional[int] = None,
+        session_id: Optional[uuid.UUID] = None,
+    ) -> None:
+        """Return once the answer is durable in the log."""
+        if not self.accepting:
+            self.rejected += 1
+            raise AnswerBufferFull("Answer buffer is not accepting answers")
+        if self.unflushed() >= self.max_pending:
+            self.rejected += 1
+            raise AnswerBufferFull("Too many answers waiting to be written")
+
+        record = BufferedAnswer(
+            ingest_id=str(uuid.uuid4()),
+            user_id=user_id,
+            question_id=question_id,
+            topic_id=key.topic_id,
+            session_id=str(session_id) if session_id else None,
+            user_answer=user_answer,
+            is_correct=is_correct,
+            time_spent_seconds=time_spent_seconds,
+            answered_at=datetime.utcnow().isoformat(),
+        )
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((record, future))
+        self._wake.set()
+        await future
+        self.acknowledged += 1
+
+    async def _write_loop(self) -> None:
+        # Runs until stop() sets _closing and the queue is drained, so every
+        # submit() gets an answer
+        while True:
+            if not self._queue:
+                if self._closing:
+                    return
+                await self._wake.wait()
+                self._wake.clear()
+                continue
+            batch, self._queue = self._queue, []
+
+            body = "".join(json.dumps(asdict(r), separators=(",", ":")) + "\n" for r, _ in batch)
+            try:
+                async with self._lock:
+                    await asyncio.to_thread(self._append, body.encode("utf-8"))
+                    self._pending.extend(r for r, _ in batch)
+            except Exception as e:
+                logger.exception("Answer log write failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+            if len(self._pending) >= self.batch_size:
+                self._flush_now.set()
+
+    def _append(self, body: bytes) -> None:
+        os.write(self._fd, body)
+        os.fsync(self._fd)
+        self.fsyncs += 1
+
+    def _create_segment(self) -> Tuple[Path, int]:
+        self.wal_dir.mkdir(parents=True, exist_ok=True)
+        path = self.wal_dir / f"answers-{os.getpid()}-{time.time_ns()}.wal"
+        # Created and locked under a name _recover() does not glob, then renamed,
+        # so no other worker can adopt a segment before its owner holds the flock
+        staging = path.with_suffix(".new")
+        fd = os.open(staging, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            os.rename(staging, path)
+        except BaseException:
+            os.close(fd)
+            staging.unlink(missing_ok=True)
+            raise
+        return path, fd
+
+    def _open_segment(self) -> None:
+        self._segment, self._fd = self._create_segment()
+
+    def _close_segment(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)  # also releases the flock
+        self._segment, self._fd = None, None
+
+    # Flushing
+
+    async def _flush_loop(self) -> None:
+        failures = 0
+        while True:
+            # Back off while flushes keep failing; the bounded queue rejects meanwhile
+            timeout = min(self.flush_interval * 2 ** failures, MAX_FLUSH_BACKOFF_SECONDS)
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.flush_errors += 1
+                logger.exception("Answer buffer flush failed; %d answers kept", self.unflushed())
+                failures = min(failures + 1, 16)
+            else:
+                failures = 0 if not self._sealed else min(failures + 1, 16)
+
+    async def flush(self) -> None:
+        """Seal the current segment and write every sealed segment to Postgres."""
+        async with self._lock:
+            if self._pending:
+                # Open the next segment first so a failure leaves the current one in place
+                segment = self._create_segment()
+                # The sealed segment keeps its fd, and so its flock, until deleted
+                self._sealed.append((self._segment, self._pending, self._fd))
+                self._pending = []
+                self._segment, self._fd = segment
+
+        while self._sealed:
+            path, records, fd = self._sealed[0]
+            try:
+                for i in range(0, len(records), self.batch_size):
+                    chunk = records[i:i + self.batch_size]
+                    try:
+                        await self._write_batch(chunk)
+                    except IntegrityError:
+                        await self._write_each(chunk)
+            except Exception:
+                # Keep the segment; the next tick retries it (replay is idempotent)
+                self.flush_errors += 1
+                logger.exception("Answer buffer flush failed; %d answers kept", self.unflushed())
+                return
+            path.unlink(missing_ok=True)
+            os.close(fd)
+            self._sealed.pop(0)
+
+    async def _write_each(self, records: List[BufferedAnswer]) -> None:
+        """Isolate answers whose user or question was deleted after acknowledgement."""
+        for record in records:
+            try:
+                await self._write_batch([record])
+            except IntegrityError:
+                self.dropped += 1
+                logger.warning("Dropping buffered answer %s: %s", record.ingest_id, asdict(record))
+
+    async def _write_batch(self, records: List[BufferedAnswer]) -> None:
+        """Apply one batch in a single transaction with a fixed number of statements."""
+        async with async_session_maker() as db:
+            # session_id is only checked here: keep it only on the owner's answers
+            session_ids = {uuid.UUID(r.session_id) for r in records if r.session_id}
+            owners = {}
+            if session_ids:
+                owners = dict((await db.execute(
+                    select(StudySession.session_id, StudySession.user_id)
+                    .where(StudySession.session_id.in_(session_ids))
+                )).all())
+            for r in records:
+                if r.session_id and owners.get(uuid.UUID(r.session_id)) != r.user_id:
+                    r.session_id = None
+
+            inserted = set((await db.scalars(
+                insert(UserAnswer)
+                .values([
+                    {
+                        "ingest_id": uuid.UUID(r.ingest_id),
+                        "user_id": r.user_id,
+                        "question_id": r.question_id,
+                        "session_id": uuid.UUID(r.session_id) if r.session_id else None,
+                        "user_answer": r.user_answer,
+                        "is_correct": r.is_correct,
+                        "time_spent_seconds": r.time_spent_seconds,
+                        "answered_at": datetime.fromisoformat(r.answered_at),
+                    }
+                    for r in records
+                ])
+                .on_conflict_do_nothing(index_elements=[UserAnswer.ingest_id])
+                .returning(UserAnswer.ingest_id)
+            )).all())
+            fresh = [r for r in records if uuid.UUID(r.ingest_id) in inserted]
+            self.duplicates += len(records) - len(fresh)
+
+            if fresh:
+                await self._apply_counters(db, fresh)
+            await db.commit()
+
+        self.flushed += len(fresh)
+        self.batches += 1
+
+    async def _apply_counters(self, db: AsyncSession, records: List[BufferedAnswer]) -> None:
+        """Fold the counter updates of newly inserted answers into set-based statements.
+
+        Rows go in key order so concurrent flushes from several workers lock
+        them in the same order.
+        """
+        zone = ZoneInfo(settings.DEFAULT_TIMEZONE)
+        uses: Dict[int, int] = defaultdict(int)
+        sessions: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        wrong: Dict[Tuple[int, int], int] = defaultdict(int)
+        users: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+        daily: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0, 0])
+
+        for r in records:
+            uses[r.question_id] += 1
+            if r.session_id:
+                sessions[r.session_id][0] += 1
+                sessions[r.session_id][1] += int(r.is_correct)
+            if not r.is_correct:
+                wrong[r.user_id, r.question_id] += 1
+            users[r.user_id][0] += 1
+            users[r.user_id][1] += int(r.is_correct)
+            local_date = (
+                datetime.fromisoformat(r.answered_at)
+                .replace(tzinfo=timezone.utc)
+                .astimezone(zone)
+                .date()
+            )
+            totals = daily[r.user_id, r.topic_id, local_date]
+            totals[0] += 1
+            totals[1] += int(r.is_correct)
+            totals[2] += r.time_spent_seconds or 0
+
+        deltas = values(
+            column("question_id", Integer), column("uses", Integer), name="deltas"
+        ).data(sorted(uses.items()))
+        await db.execute(
+            update(Question)
+            .where(Question.question_id == deltas.c.question_id)
+            .values(used_count=Question.used_count + deltas.c.uses)
+            .execution_options(synchronize_session=False)
+        )
+
+        if sessions:
+            progress = values(
+                column("session_id", PG_UUID(as_uuid=True)),
+                column("attempted", Integer),
+                column("correct", Integer),
+                name="progress",
+            ).data([(uuid.UUID(sid), a, c) for sid, (a, c) in sorted(sessions.items())])
+            # Answers that arrive after the session ended are kept but not counted
+            await db.execute(
+                update(StudySession)
+                .where(
+                    StudySession.session_id == progress.c.session_id,
+                    StudySession.status == "active",
+                )
+                .values(
+                    questions_attempted=StudySession.questions_attempted + progress.c.attempted,
+                    correct_answers=StudySession.correct_answers + progress.c.correct,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        opened: Dict[int, int] = defaultdict(int)
+        if wrong:
+            stmt = insert(MistakeNote).values([
+                {"user_id": user_id, "question_id": question_id, "mistake_count": count}
+                for (user_id, question_id), count in sorted(wrong.items())
+            ])
+            result = await db.execute(
+                stmt.on_conflict_do_update(
+                    constraint="uq_user_question",
+                    set_={
+                        "mistake_count": MistakeNote.mistake_count + stmt.excluded.mistake_count,
+                        "last_mistake_at": func.now(),
+                    },
+                )
+                # xmax is 0 only for rows this statement inserted
+                .returning(MistakeNote.user_id, literal_column("xmax = 0"))
+            )
+            for user_id, is_new in result:
+                opened[user_id] += int(is_new)
+
+        stmt = insert(UserStats).values([
+            {
+                "user_id": user_id,
+                "total_questions": answers,
+                "total_correct": correct,
+                "open_mistakes": opened[user_id],
+                "total_mistakes": opened[user_id],
+            }
+            for user_id, (answers, correct) in sorted(users.items())
+        ])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserStats.user_id],
+                set_={
+                    **{
+                        name: getattr(UserStats, name) + stmt.excluded[name]
+                        for name in ("total_questions", "total_correct", "open_mistakes", "total_mistakes")
+                    },
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+        stmt = insert(UserDailyStats).values([
+            {
+                "user_id": user_id,
+                "topic_id": topic_id,
+                "local_date": local_date,
+                "answers": answers,
+                "correct": correct,
+                "time_spent_seconds": seconds,
+            }
+            for (user_id, topic_id, local_date), (answers, correct, seconds) in sorted(
+                daily.items(), key=_daily_order
+            )
+        ])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserDailyStats.user_id, UserDailyStats.topic_id, UserDailyStats.local_date],
+                set_={
+                    name: getattr(UserDailyStats, name) + stmt.excluded[name]
+                    for name in ("answers", "correct", "time_spent_seconds")
+                },
+            )
+        )
+
+    # Lifecycle
+
+    def _recover(self) -> int:
+        """Adopt segments whose writer is gone (their flock is free)."""
+        if not self.wal_dir.exists():
+            return 0
+        recovered = 0
+        # Staging files are renamed right after creation, so one left behind is empty
+        for path in self.wal_dir.glob("answers-*.new"):
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                if os.fstat(fd).st_size == 0:
+                    path.unlink(missing_ok=True)
+            except BlockingIOError:
+                pass
+            finally:
+                os.close(fd)
+        for path in sorted(self.wal_dir.glob("answers-*.wal")):
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue  # flushed and deleted by its owner meanwhile
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)  # a live worker owns it
+                continue
+
+            records = []
+            with os.fdopen(os.dup(fd), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(BufferedAnswer(**json.loads(line)))
+                    except (ValueError, TypeError):
+                        # A torn last line was never acknowledged
+                        logger.warning("Skipping unreadable line in %s", path)
+            if records:
+                self._sealed.append((path, records, fd))
+                recovered += len(records)
+            else:
+                path.unlink(missing_ok=True)
+                os.close(fd)
+        return recovered
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._closing = False
+        self.recovered = await asyncio.to_thread(self._recover)
+        if self.recovered:
+            logger.info("Replaying %d buffered answers from %s", self.recovered, self.wal_dir)
+        self._open_segment()
+        await self.flush()
+        self._tasks = [
+            asyncio.create_task(self._write_loop()),
+            asyncio.create_task(self._flush_loop()),
+        ]
+
+    async def stop(self) -> None:
+        """Stop accepting, then write out everything acknowledged so far."""
+        if not self.running:
+            return
+        writer, flusher = self._tasks
+        self._closing = True
+        self._wake.set()
+        await writer
+        flusher.cancel()
+        try:
+            await flusher
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception("Answer buffer flusher had stopped")
+        self._tasks = []
+
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Final answer buffer flush failed; %d answers kept", self.unflushed())
+        # Whatever could not be written stays on disk for the next start
+        for _, _, fd in self._sealed:
+            os.close(fd)
+        self._sealed = []
+        segment = self._segment
+        self._close_segment()
+        if segment is not None and segment.stat().st_size == 0:
+            segment.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        return {
+            "mode": settings.ANSWER_INGEST_MODE,
+            "running": self.running,
+            "accepting": self.accepting,
+            "acknowledged": self.acknowledged,
+            "flushed": self.flushed,
+            "unflushed": self.unflushed(),
+            "duplicates": self.duplicates,
+            "batches": self.batches,
+            "fsyncs": self.fsyncs,
+            "rejected": self.rejected,
+            "recovered": self.recovered,
+            "flush_errors": self.flush_errors,
+            "dropped": self.dropped,
+            "cached_keys": len(self._keys),
+        }
+
+
+# Singleton instance
+answer_buffer = AnswerBuffer(
+    wal_dir=settings.ANSWER_BUFFER_DIR,
+    batch_size=settings.ANSWER_BUFFER_BATCH_SIZE,
+    flush_interval=settings.ANSWER_BUFFER_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.ANSWER_BUFFER_MAX_PENDING,
+    key_cache_size=settings.ANSWER_BUFFER_KEY_CACHE_SIZE,
+)
@@ -0,0 +1,163 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Integer, Row, cast, exists, func, literal, literal_column, select, true, update
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Question, StudySession, UserAnswer, MistakeNote, UserStats, UserDailyStats
+from app.services.user_stats import rollup_today
+
+
+async def write_answer(
+    db: AsyncSession,
+    user_id: int,
+    question_id: int,
+    user_answer: str,
+    time_spent_seconds: Optional[int] = None,
+    session_id: Optional[UUID] = None,
+) -> Optional[Row]:
+    """Grade and record one answer in a single statement.
+
+    Data-modifying CTEs bump ``used_count`` and grade against the returned
+    key, insert the answer, upsert the mistake note on ``uq_user_question``,
+    advance the session counters and add to user_stats and the daily
+    rollup. Every counter is an in-place increment, so concurrent answers
+    never lose updates. The caller commits.
+
+    Returns None when the question does not exist (nothing is written).
+    Otherwise the row has question_id, correct_answer, explanation,
+    is_correct, and questions_attempted / correct_answers of the session,
+    which are None if ``session_id`` was given but is not the user's
+    active session; the caller must then roll back. A ``session_id`` that
+    does not exist at all fails the answer's foreign key (IntegrityError).
+    """
+    graded = (
+        update(Question)
+        .where(Question.question_id == question_id)
+        .values(used_count=Question.used_count + 1)
+        .returning(
+            Question.question_id,
+            Question.topic_id,
+            Question.correct_answer,
+            Question.explanation,
+            (func.lower(Question.correct_answer) == user_answer).label("is_correct"),
+        )
+        .cte("graded")
+    )
+    correct = cast(graded.c.is_correct, Integer)
+
+    answer = (
+        insert(UserAnswer)
+        .from_select(
+            ["user_id", "question_id", "session_id", "user_answer", "is_correct", "time_spent_seconds"],
+            select(
+                literal(user_id),
+                graded.c.question_id,
+                literal(session_id, PG_UUID(as_uuid=True)),
+                literal(user_answer),
+                graded.c.is_correct,
+                literal(time_spent_seconds, Integer),
+            ),
+        )
+        .returning(UserAnswer.answer_id)
+        .cte("answer")
+    )
+
+    mistake = (
+        insert(MistakeNote)
+        .from_select(
+            ["user_id", "question_id"],
+            select(literal(user_id), graded.c.question_id).where(~graded.c.is_correct),
+        )
+        .on_conflict_do_update(
+            constraint="uq_user_question",
+            set_={
+                "mistake_count": MistakeNote.mistake_count + 1,
+                "last_mistake_at": func.now(),
+            },
+        )
+        # xmax is 0 only for rows this statement inserted
+        .returning(literal_column("xmax = 0").label("opened"))
+        .cte("mistake")
+    )
+    opened = select(func.count()).select_from(mistake).where(mistake.c.opened).scalar_subquery()
+
+    stats_insert = insert(UserStats).from_select(
+        ["user_id", "total_questions", "total_correct", "open_mistakes", "total_mistakes"],
+        select(literal(user_id), literal(1), correct, opened, opened),
+    )
+    stats = (
+        stats_insert.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                **{
+                    name: getattr(UserStats, name) + stats_insert.excluded[name]
+                    for name in ("total_questions", "total_correct", "open_mistakes", "total_mistakes")
+                },
+                "updated_at": func.now(),
+            },
+        )
+        .returning(UserStats.user_id)
+        .cte("stats")
+    )
+
+    daily_insert = insert(UserDailyStats).from_select(
+        ["user_id", "topic_id", "local_date", "answers", "correct", "time_spent_seconds"],
+        select(
+            literal(user_id),
+            graded.c.topic_id,
+            rollup_today(),
+            literal(1),
+            correct,
+            literal(time_spent_seconds or 0),
+        ),
+    )
+    daily = (
+        daily_insert.on_conflict_do_update(
+            index_elements=[UserDailyStats.user_id, UserDailyStats.topic_id, UserDailyStats.local_date],
+            set_={
+                name: getattr(UserDailyStats, name) + daily_insert.excluded[name]
+                for name in ("answers", "correct", "time_spent_seconds")
+            },
+        )
+        .returning(UserDailyStats.id)
+        .cte("daily")
+    )
+
+    columns = [
+        graded.c.question_id,
+        graded.c.correct_answer,
+        graded.c.explanation,
+        graded.c.is_correct,
+    ]
+    query = select(*columns).add_cte(answer, stats, daily)
+
+    if session_id is None:
+        query = query.add_columns(
+            literal(None, Integer).label("questions_attempted"),
+            literal(None, Integer).label("correct_answers"),
+        ).select_from(graded)
+    else:
+        progress = (
+            update(StudySession)
+            .where(
+                StudySession.session_id == session_id,
+                StudySession.user_id == user_id,
+                StudySession.status == "active",
+                exists(select(graded.c.question_id)),
+            )
+            .values(
+                questions_attempted=StudySession.questions_attempted + 1,
+                correct_answers=StudySession.correct_answers + select(correct).scalar_subquery(),
+            )
+            .returning(StudySession.questions_attempted, StudySession.correct_answers)
+            .cte("progress")
+        )
+        query = query.add_columns(
+            progress.c.questions_attempted,
+            progress.c.correct_answers,
+        ).select_from(graded).outerjoin(progress, true())
+
+    result = await db.execute(query)
+    return result.one_or_none()
@@ -0,0 +1,147 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import User
+
+
+# Columns copied into the snapshot; the password hash never enters the cache
+SNAPSHOT_COLUMNS = tuple(
+    attr.key for attr in inspect(User).column_attrs if attr.key != "password_hash"
+)
+
+
+class AuthCache:
+    """Bounded TTL cache of verified access tokens to user snapshots.
+
+    Entries live until ``ttl_seconds`` pass or the token expires, whichever
+    comes first; the least recently used entry is evicted past
+    ``max_entries``. Every hit returns a new transient ``User`` so requests
+    never share ORM state. Counters and entries are per worker process.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, token: str) -> Optional[User]:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(token)
+        if entry is not None:
+            expires_at, snapshot = entry
+            if time.time() < expires_at:
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return User(**snapshot)
+            self._discard(token)
+        self.misses += 1
+        return None
+
+    def set(self, token: str, user: User, token_expires_at: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+
+        self._discard(token)
+        self._entries[token] = (expires_at, {key: getattr(user, key) for key in SNAPSHOT_COLUMNS})
+        self._tokens_by_user.setdefault(user.user_id, set()).add(token)
+        while len(self._entries) > self.max_entries:
+            oldest, _ = next(iter(self._entries.items()))
+            self._discard(oldest)
+            self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token of ``user_id``."""
+        tokens = self._tokens_by_user.pop(user_id, ())
+        for token in tokens:
+            self._entries.pop(token, None)
+        if tokens:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+    def _discard(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry[1]["user_id"]
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "entries": len(self._entries),
+            "users": len(self._tokens_by_user),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Singleton instance
+auth_cache = AuthCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+)
+
+
+# ORM changes that revoke access evict at flush, and again after commit so a
+# request that re-cached the old row in between cannot keep it. Bulk UPDATE or
+# DELETE statements and other workers are only covered by the TTL.
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target: User) -> None:
+    if inspect(target).attrs.is_active.history.has_changes():
+        _evict_on_commit(target)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target: User) -> None:
+    _evict_on_commit(target)
+
+
+def _evict_on_commit(target: User) -> None:
+    auth_cache.invalidate_user(target.user_id)
+    session = inspect(target).session
+    if session is not None:
+        session.info.setdefault("auth_cache_evict", set()).add(target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_after_commit(session: Session) -> None:
+    for user_id in session.info.pop("auth_cache_evict", ()):
+        auth_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_evictions(session: Session) -> None:
+    session.info.pop("auth_cache_evict", None)
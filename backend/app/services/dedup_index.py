@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import re
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models import Question
+from app.schemas import ClaudeQuestionSchema
+
+
+logger = logging.getLogger(__name__)
+
+# Everything except letters and digits (Hangul included) is ignored
+_NON_WORD = re.compile(r"[\W_]+")
+_MASK_64 = (1 << 64) - 1
+_MASK_32 = (1 << 32) - 1
+_EMPTY = 1 << 63  # larger than any bin value (at most 2**64 // num_perm)
+_OFFSET = 0x9E3779B97F4A7C15
+
+Signature = array
+QuestionLike = Union[Question, ClaudeQuestionSchema]
+
+
+def question_text(q: QuestionLike) -> str:
+    """Text a question is compared on: the stem and its four options."""
+    return " ".join((q.question_text, q.option_a, q.option_b, q.option_c, q.option_d))
+
+
+class NearDuplicateIndex:
+    """In-process MinHash/LSH index over question text.
+
+    Text is normalized (case, whitespace and punctuation removed) and split
+    into character shingles, which works for Korean without a tokenizer.
+    Each question keeps a ``DEDUP_NUM_PERM``-value MinHash signature, split
+    into ``DEDUP_BANDS`` LSH bands; a lookup only compares signatures that
+    share a band bucket, so its cost does not grow with the bank. Memory is
+    roughly 1 KB per indexed question.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 32,
+        bands: int = 8,
+        shingle_size: int = 3,
+        threshold: float = 0.8,
+        enabled: bool = True,
+        sync_overlap: int = 1000,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.enabled = enabled
+        self.sync_overlap = sync_overlap
+
+        self._signatures: Dict[int, Signature] = {}
+        # Per band: bucket key -> question_id, or a list of ids on collision
+        self._buckets: List[Dict[int, Union[int, List[int]]]] = [{} for _ in range(bands)]
+        # Highest id read back from the database; local add() calls never move
+        # it, so rows other workers insert with lower ids are still picked up
+        self._synced_question_id = 0
+        self._task: Optional[asyncio.Task] = None
+
+        self.ready = False
+        self.lookups = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, text: str) -> Signature:
+        """One-permutation MinHash: each shingle hash lands in one of
+        ``num_perm`` bins and every bin keeps its minimum, so the cost is
+        linear in the number of shingles rather than shingles x permutations.
+        """
+        normalized = _NON_WORD.sub("", text.lower())
+        k = self.shingle_size
+        if len(normalized) <= k:
+            shingles = {normalized}
+        else:
+            shingles = {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+
+        num_perm = self.num_perm
+        bins = [_EMPTY] * num_perm
+        for shingle in shingles:
+            h = hash(shingle) & _MASK_64
+            b = h % num_perm
+            v = h // num_perm
+            if v < bins[b]:
+                bins[b] = v
+
+        # Densify: an empty bin borrows from the next filled bin, offset by distance
+        if _EMPTY in bins:
+            filled = list(bins)
+            for b in range(num_perm):
+                if filled[b] == _EMPTY:
+                    for step in range(1, num_perm):
+                        v = filled[(b + step) % num_perm]
+                        if v != _EMPTY:
+                            bins[b] = v + step * _OFFSET
+                            break
+        # Keep 32 bits per value to halve the memory per stored signature
+        return array("I", [v & _MASK_32 for v in bins])
+
+    def _band_keys(self, sig: Signature) -> List[int]:
+        r = self.rows
+        return [hash(tuple(sig[i * r:(i + 1) * r])) for i in range(self.bands)]
+
+    def similarity(self, a: Signature, b: Signature) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(x == y for x, y in zip(a, b)) / self.num_perm
+
+    def find(self, sig: Signature) -> Optional[int]:
+        """Return the id of a stored near-duplicate of ``sig``, if any."""
+        self.lookups += 1
+        checked = set()
+        for band, key in enumerate(self._band_keys(sig)):
+            entry = self._buckets[band].get(key)
+            if entry is None:
+                continue
+            for question_id in entry if isinstance(entry, list) else (entry,):
+                if question_id in checked:
+                    continue
+                checked.add(question_id)
+                if self.similarity(sig, self._signatures[question_id]) >= self.threshold:
+                    return question_id
+        return None
+
+    def add(self, question_id: int, sig: Optional[Signature]) -> None:
+        if sig is None or question_id in self._signatures:
+            return
+        self._signatures[question_id] = sig
+        for band, key in enumerate(self._band_keys(sig)):
+            bucket = self._buckets[band]
+            entry = bucket.get(key)
+            if entry is None:
+                bucket[key] = question_id
+            elif isinstance(entry, list):
+                entry.append(question_id)
+            else:
+                bucket[key] = [entry, question_id]
+
+    def filter_new(
+        self,
+        questions: Sequence[ClaudeQuestionSchema],
+    ) -> List[Tuple[ClaudeQuestionSchema, Optional[Signature]]]:
+        """Drop questions that are near-duplicates of the bank or of each other."""
+        if not self.enabled:
+            return [(q, None) for q in questions]
+
+        accepted: List[Tuple[ClaudeQuestionSchema, Optional[Signature]]] = []
+        for q in questions:
+            sig = self.signature(question_text(q))
+            duplicate = self.find(sig) is not None or any(
+                self.similarity(sig, other) >= self.threshold for _, other in accepted
+            )
+            if duplicate:
+                self.rejected += 1
+                continue
+            accepted.append((q, sig))
+        return accepted
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "indexed": len(self),
+            "lookups": self.lookups,
+            "rejected": self.rejected,
+        }
+
+    async def sync(self, batch_size: int = 1000) -> int:
+        """Index questions inserted since the last sync (e.g. by other workers).
+
+        Ids are allocated before commit, so a row can become visible after a
+        higher id was already synced. Each pass therefore re-reads the last
+        ``sync_overlap`` ids behind the watermark; rows already indexed are
+        skipped without rehashing.
+        """
+        added = 0
+        since = max(self._synced_question_id - self.sync_overlap, 0)
+        async with async_session_maker() as db:
+            result = await db.stream(
+                select(
+                    Question.question_id,
+                    Question.question_text,
+                    Question.option_a,
+                    Question.option_b,
+                    Question.option_c,
+                    Question.option_d,
+                )
+                .where(Question.question_id > since)
+                .order_by(Question.question_id)
+                .execution_options(yield_per=batch_size)
+            )
+            async for rows in result.partitions():
+                for row in rows:
+                    if row.question_id in self._signatures:
+                        continue
+                    self.add(row.question_id, self.signature(question_text(row)))
+                    added += 1
+                self._synced_question_id = max(self._synced_question_id, rows[-1].question_id)
+                # Yield to the event loop between batches while building
+                await asyncio.sleep(0)
+        return added
+
+    async def run(self) -> None:
+        while True:
+            try:
+                added = await self.sync()
+                if not self.ready:
+                    self.ready = True
+                    logger.info("Near-duplicate index built with %d questions", added)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Near-duplicate index sync failed")
+            await asyncio.sleep(settings.DEDUP_SYNC_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+dedup_index = NearDuplicateIndex(
+    num_perm=settings.DEDUP_NUM_PERM,
+    bands=settings.DEDUP_BANDS,
+    shingle_size=settings.DEDUP_SHINGLE_SIZE,
+    threshold=settings.DEDUP_THRESHOLD,
+    enabled=settings.DEDUP_ENABLED,
+    sync_overlap=settings.DEDUP_SYNC_OVERLAP_IDS,
+)
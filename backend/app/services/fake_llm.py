@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import AsyncIterator, List, Tuple
+
+from app.services.llm_cache import CachedCompletion
+from app.services.llm_provider import LLMProvider, StreamEvent
+from app.services.rate_limiter import estimate_tokens
+
+
+_TOPIC = re.compile(r"주제:\s*(.+)")
+_DIFFICULTY = re.compile(r"난이도:\s*(\w+)")
+_COUNT = re.compile(r"문제 수:\s*(\d+)")
+
+# Vocabulary for generated text; random word mixes keep fake questions
+# distinct enough to pass the near-duplicate filter
+_TERMS = (
+    "데이터", "전처리", "결측치", "이상치", "정규화", "표준화", "원핫인코딩", "특성공학",
+    "학습데이터", "검증데이터", "테스트데이터", "과적합", "과소적합", "교차검증", "하이퍼파라미터",
+    "선형회귀", "로지스틱회귀", "의사결정나무", "랜덤포레스트", "부스팅", "서포트벡터머신",
+    "군집분석", "차원축소", "주성분분석", "신경망", "활성화함수", "손실함수", "경사하강법",
+    "정확도", "정밀도", "재현율", "F1점수", "ROC곡선", "혼동행렬", "평균제곱오차",
+    "판다스", "데이터프레임", "시각화", "히스토그램", "상관계수", "샘플링", "레이블",
+)
+_VERBS = (
+    "을 사용한다", "을 줄인다", "을 높인다", "에 영향을 준다", "과 무관하다",
+    "보다 우선한다", "을 먼저 확인한다", "으로 해결된다", "이 필요하다", "을 비교한다",
+)
+
+# Characters per streamed chunk when emulating token-by-token output
+_CHUNK_CHARS = 8
+
+
+def parse_prompt(messages: List[dict]) -> Tuple[str, str, int]:
+    """Topic, difficulty and question count from a ``get_user_prompt`` message."""
+    prompt = messages[-1]["content"]
+    topic = _TOPIC.search(prompt)
+    difficulty = _DIFFICULTY.search(prompt)
+    count = _COUNT.search(prompt)
+    return (
+        topic.group(1).strip() if topic else "AICE",
+        difficulty.group(1) if difficulty else "medium",
+        int(count.group(1)) if count else 5,
+    )
+
+
+def _phrase(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_TERMS) for _ in range(words)) + rng.choice(_VERBS)
+
+
+def fake_questions(messages: List[dict], rng: random.Random) -> str:
+    """A JSON array of well-formed questions, as the real model would return."""
+    topic, difficulty, count = parse_prompt(messages)
+    questions = []
+    for _ in range(count):
+        questions.append({
+            "question_text": f"[{topic}] {_phrase(rng, 4)}. 이에 대한 설명으로 옳은 것은?",
+            "option_a": _phrase(rng, 3),
+            "option_b": _phrase(rng, 3),
+            "option_c": _phrase(rng, 3),
+            "option_d": _phrase(rng, 3),
+            "correct_answer": rng.choice("abcd"),
+            "explanation": f"{_phrase(rng, 5)}. {_phrase(rng, 4)}. {_phrase(rng, 4)}.",
+            "difficulty": difficulty,
+        })
+    return json.dumps(questions, ensure_ascii=False, indent=2)
+
+
+class FakeProvider(LLMProvider):
+    """In-process provider returning generated questions with simulated timing.
+
+    Output is deterministic for a given seed and call sequence: each call
+    seeds its generator from ``seed``, a call counter and the prompt, so
+    repeated prompts still produce different questions. A response takes
+    ``latency_seconds`` before the first token, then ``tokens_per_second``
+    (tokens counted like ``estimate_tokens``). Output longer than
+    ``max_tokens`` is cut off, like a real ``finish_reason == "length"``.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        model: str,
+        latency_seconds: float = 1.0,
+        tokens_per_second: float = 80.0,
+        seed: int = 0,
+    ):
+        super().__init__(model)
+        self.latency_seconds = latency_seconds
+        self.tokens_per_second = tokens_per_second
+        self.seed = seed
+        self.calls = 0
+
+    def render(self, messages: List[dict], max_tokens: int) -> Tuple[str, int]:
+        """Response text and its prompt token count for one call."""
+        self.calls += 1
+        prompt = "".join(m["content"] for m in messages)
+        digest = hashlib.sha256(f"{self.seed}:{self.calls}:{prompt}".encode("utf-8")).hexdigest()
+        content = fake_questions(messages, random.Random(digest))
+        return content[:max_tokens], estimate_tokens(prompt)
+
+    async def complete(
+        self,
+        messages: List[dict],
+        max_tokens: int,
+        temperature: float,
+    ) -> CachedCompletion:
+        content, prompt_tokens = self.render(messages, max_tokens)
+        completion_tokens = estimate_tokens(content)
+        await asyncio.sleep(self.latency_seconds + completion_tokens / self.tokens_per_second)
+        return CachedCompletion(
+            content=content,
+            model=self.model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+        )
+
+    async def open_stream(
+        self,
+        messages: List[dict],
+        max_tokens: int,
+        temperature: float,
+    ) -> AsyncIterator[StreamEvent]:
+        content, prompt_tokens = self.render(messages, max_tokens)
+        await asyncio.sleep(self.latency_seconds)
+        return self._events(content, prompt_tokens)
+
+    async def _events(self, content: str, prompt_tokens: int) -> AsyncIterator[StreamEvent]:
+        started = time.monotonic()
+        for end in range(_CHUNK_CHARS, len(content) + _CHUNK_CHARS, _CHUNK_CHARS):
+            # Pace against the start time so sleep overhead does not accumulate
+            due = started + estimate_tokens(content[:end]) / self.tokens_per_second
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield StreamEvent(text=content[end - _CHUNK_CHARS:end], model=self.model)
+
+        yield StreamEvent(
+            model=self.model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=estimate_tokens(content),
+        )
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import GenerationJob
+
+
+JOB_KINDS = ("questions", "session")
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+async def enqueue_job(db: AsyncSession, user_id: int, kind: str, payload: dict) -> GenerationJob:
+    """Queue a job and commit it so workers can pick it up."""
+    job = GenerationJob(user_id=user_id, kind=kind, payload=payload, status="pending")
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def claim_job(db: AsyncSession) -> Optional[GenerationJob]:
+    """Claim the oldest runnable job with ``SELECT ... FOR UPDATE SKIP LOCKED``.
+
+    Jobs left ``running`` longer than ``JOB_TIMEOUT_SECONDS`` belong to a
+    worker that died and are claimed again. The claim is committed before the
+    job runs, so no row lock is held during the LLM call.
+    """
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.JOB_TIMEOUT_SECONDS)
+    while True:
+        result = await db.execute(
+            select(GenerationJob)
+            .where(
+                or_(
+                    GenerationJob.status == "pending",
+                    and_(
+                        GenerationJob.status == "running",
+                        GenerationJob.started_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(GenerationJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = result.scalar_one_or_none()
+        if job is None:
+            await db.rollback()
+            return None
+
+        if job.attempts < settings.JOB_MAX_ATTEMPTS:
+            break
+
+        job.status = "failed"
+        job.error = job.error or "Job timed out"
+        job.finished_at = datetime.utcnow()
+        await db.commit()
+
+    job.status = "running"
+    job.started_at = datetime.utcnow()
+    job.attempts += 1
+    await db.commit()
+    return job
+
+
+async def finish_job(
+    db: AsyncSession,
+    job: GenerationJob,
+    result: Optional[dict] = None,
+    error: Optional[str] = None,
+) -> None:
+    job.status = "failed" if error is not None else "completed"
+    job.result = result
+    job.error = error
+    job.finished_at = datetime.utcnow()
+    db.add(job)
+    await db.commit()
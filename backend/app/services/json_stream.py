@@ -0,0 +1,168 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+# Characters that matter outside / inside a JSON string
+_STRUCTURAL = re.compile(r'[{}"]')
+_IN_STRING = re.compile(r'["\\]')
+# Boundary between two objects, used to resync after a broken item
+_OBJECT_BOUNDARY = re.compile(r'\}\s*,\s*\{')
+
+
+@dataclass
+class ParseIssue:
+    """A top-level item that could not be parsed."""
+    index: int
+    error: str
+    snippet: str
+
+
+@dataclass
+class ParseResult:
+    items: List[dict] = field(default_factory=list)
+    issues: List[ParseIssue] = field(default_factory=list)
+    truncated: bool = False
+
+
+class IncrementalArrayParser:
+    """Parse a (possibly streamed) JSON array of objects one object at a time.
+
+    Feed chunks as they arrive; every complete top-level object is returned as
+    soon as its closing brace is seen. Items that fail to decode are skipped
+    and recorded in ``issues``. Text outside objects (markdown fences, prose,
+    the array brackets themselves) is ignored, so an array cut off at
+    ``max_tokens`` still yields every object completed before the cut.
+    """
+
+    def __init__(self):
+        self.issues: List[ParseIssue] = []
+        self.truncated = False
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._start: Optional[int] = None
+        self._in_string = False
+        self._index = 0
+
+    def feed(self, chunk: str) -> List[dict]:
+        self._buffer += chunk
+        items: List[dict] = []
+        buffer = self._buffer
+        pos = self._pos
+
+        while True:
+            if self._in_string:
+                match = _IN_STRING.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == "\\":
+                    # Skip the escaped character; wait for it if not received yet
+                    if match.end() >= len(buffer):
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                continue
+
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            ch = match.group()
+            pos = match.end()
+
+            if ch == '"':
+                # Strings only matter inside an object
+                self._in_string = self._depth > 0
+            elif ch == "{":
+                if self._depth == 0:
+                    self._start = match.start()
+                self._depth += 1
+            elif self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    items.extend(self._decode(buffer[self._start:pos]))
+                    self._start = None
+
+        # Drop text that can no longer belong to an object
+        keep_from = self._start if self._start is not None else pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        if self._start is not None:
+            self._start = 0
+
+        return items
+
+    def close(self) -> List[dict]:
+        """Finish parsing. A dangling partial object is reported as truncated."""
+        if self._start is not None:
+            self.truncated = True
+            self.issues.append(ParseIssue(
+                index=self._index,
+                error="truncated object at end of output",
+                snippet=self._buffer[:80],
+            ))
+            self._index += 1
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._start = None
+        self._in_string = False
+        return []
+
+    def _decode(self, text: str) -> List[dict]:
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError as e:
+            # A stray quote can swallow the following objects; try to split them back out
+            parts = _OBJECT_BOUNDARY.split(text)
+            if len(parts) > 1:
+                return self._decode_parts(parts)
+            self._report(text, str(e))
+            return []
+
+        self._index += 1
+        return [item] if isinstance(item, dict) else []
+
+    def _decode_parts(self, parts: List[str]) -> List[dict]:
+        items = []
+        last = len(parts) - 1
+        for i, part in enumerate(parts):
+            text = ("{" if i > 0 else "") + part + ("}" if i < last else "")
+            try:
+                item = json.loads(text)
+            except json.JSONDecodeError as e:
+                self._report(text, str(e))
+                continue
+            self._index += 1
+            if isinstance(item, dict):
+                items.append(item)
+        return items
+
+    def _report(self, text: str, error: str) -> None:
+        self.issues.append(ParseIssue(index=self._index, error=error, snippet=text[:80]))
+        self._index += 1
+
+
+def parse_json_array(content: str) -> ParseResult:
+    """Parse a complete LLM response, salvaging every well-formed object."""
+    # Fast path: the response is one well-formed array
+    start, end = content.find("["), content.rfind("]")
+    if 0 <= start < end:
+        try:
+            items = json.loads(content[start:end + 1])
+        except json.JSONDecodeError:
+            pass
+        else:
+            if isinstance(items, list) and all(isinstance(item, dict) for item in items):
+                return ParseResult(items=items)
+
+    parser = IncrementalArrayParser()
+    items = parser.feed(content)
+    items.extend(parser.close())
+    return ParseResult(items=items, issues=parser.issues, truncated=parser.truncated)
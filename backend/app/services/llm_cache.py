@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedCompletion:
+    content: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class LLMCacheMiss(ValueError):
+    """Raised on a cache miss while the cache is in offline mode."""
+
+
+class LLMResponseCache:
+    """Two-tier cache of chat completions keyed by a hash of model + prompt.
+
+    The memory tier is a bounded LRU; the disk tier stores one JSON file per
+    entry under ``LLM_CACHE_DIR`` and evicts the oldest files once it grows
+    past ``LLM_CACHE_DISK_MAX_BYTES``. Both tiers honour ``LLM_CACHE_TTL_SECONDS``.
+    In offline mode a miss raises ``LLMCacheMiss`` instead of calling the
+    provider, so benchmarks and dev environments can run without an API key.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        offline: bool,
+        max_entries: int,
+        ttl_seconds: int,
+        disk_dir: Optional[str],
+        disk_max_bytes: int,
+    ):
+        self.enabled = enabled or offline
+        self.offline = offline
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+
+        self._memory: "OrderedDict[str, Tuple[float, CachedCompletion]]" = OrderedDict()
+        self._disk_bytes: Optional[int] = None
+        self._disk_lock = asyncio.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(model: str, messages: List[dict], **params) -> str:
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get_or_create(
+        self,
+        key: str,
+        create: Callable[[], Awaitable[CachedCompletion]],
+    ) -> CachedCompletion:
+        if not self.enabled:
+            return await create()
+
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        if self.offline:
+            raise LLMCacheMiss(f"LLM cache miss in offline mode ({key[:12]})")
+
+        value = await create()
+        await self.set(key, value)
+        return value
+
+    async def get(self, key: str) -> Optional[CachedCompletion]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            created_at, value = entry
+            if not self._expired(created_at):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+            del self._memory[key]
+
+        if self.disk_dir is not None:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None:
+                created_at, value = entry
+                self._remember(key, created_at, value)
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: CachedCompletion) -> None:
+        created_at = time.time()
+        self._remember(key, created_at, value)
+        if self.disk_dir is not None:
+            async with self._disk_lock:
+                await asyncio.to_thread(self._write_disk, key, created_at, value)
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, value: CachedCompletion) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, CachedCompletion]]:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.warning("Discarding unreadable LLM cache entry %s", path)
+            path.unlink(missing_ok=True)
+            return None
+
+        if self._expired(data["created_at"]):
+            path.unlink(missing_ok=True)
+            return None
+        return data["created_at"], CachedCompletion(**data["value"])
+
+    def _write_disk(self, key: str, created_at: float, value: CachedCompletion) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        body = json.dumps(
+            {"created_at": created_at, "value": asdict(value)},
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        # Write then rename so readers never see a partial file
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(p.stat().st_size for p in self.disk_dir.glob("*/*.json"))
+        else:
+            self._disk_bytes += len(body)
+        if self._disk_bytes > self.disk_max_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Remove the oldest files until the disk tier is back under 90% of its cap."""
+        files = sorted(
+            ((p.stat().st_mtime, p.stat().st_size, p) for p in self.disk_dir.glob("*/*.json")),
+        )
+        total = sum(size for _, size, _ in files)
+        target = self.disk_max_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        self._disk_bytes = total
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "offline": self.offline,
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+# Singleton instance
+llm_cache = LLMResponseCache(
+    enabled=settings.LLM_CACHE_ENABLED,
+    offline=settings.LLM_CACHE_OFFLINE,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    disk_dir=settings.LLM_CACHE_DIR or None,
+    disk_max_bytes=settings.LLM_CACHE_DISK_MAX_BYTES,
+)
@@ -0,0 +1,172 @@
+import bisect
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += n
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "mean": round(self.sum / self.count, 4) if self.count else 0.0,
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class UsageCounters:
+    calls: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    requested: int = 0
+    validated: int = 0
+    parse_failures: int = 0
+    cost_usd: float = 0.0
+    wall_seconds: float = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "requested": self.requested,
+            "validated": self.validated,
+            "parse_failures": self.parse_failures,
+            "yield_rate": self.validated / self.requested if self.requested else 0.0,
+            "completion_tokens_per_question": (
+                self.completion_tokens / self.validated if self.validated else 0.0
+            ),
+            "cost_usd": round(self.cost_usd, 6),
+            "wall_seconds": round(self.wall_seconds, 3),
+        }
+
+
+@dataclass
+class CallRecord:
+    """Outcome of one completion, filled in while the call runs."""
+    topic: str
+    difficulty: str
+    requested: int
+    model: str = settings.OPENAI_MODEL
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    validated: int = 0
+    parse_failures: int = 0
+    ttft: Optional[float] = None
+    error: bool = False
+    started: float = field(default_factory=time.perf_counter)
+
+    def first_token(self) -> None:
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self.started
+
+
+def completion_cost(prompt_tokens: int, completion_tokens: int) -> float:
+    return (
+        prompt_tokens * settings.LLM_PROMPT_PRICE_PER_1K
+        + completion_tokens * settings.LLM_COMPLETION_PRICE_PER_1K
+    ) / 1000
+
+
+class LLMMetrics:
+    """In-process counters and histograms for question-generation calls.
+
+    Totals are kept per model and per (topic, difficulty), so wasteful
+    combinations (low yield, many tokens per accepted question) stand out.
+    """
+
+    def __init__(self):
+        self.wall_seconds = Histogram(LATENCY_BUCKETS)
+        self.ttft_seconds = Histogram(LATENCY_BUCKETS)
+        self.prompt_tokens = Histogram(TOKEN_BUCKETS)
+        self.completion_tokens = Histogram(TOKEN_BUCKETS)
+        self.total = UsageCounters()
+        self.by_model: Dict[str, UsageCounters] = defaultdict(UsageCounters)
+        self.by_topic: Dict[Tuple[str, str], UsageCounters] = defaultdict(UsageCounters)
+
+    def call(self, topic: str, difficulty: str, requested: int) -> CallRecord:
+        return CallRecord(topic=topic, difficulty=difficulty, requested=requested)
+
+    def record(self, call: CallRecord) -> None:
+        wall = time.perf_counter() - call.started
+        self.wall_seconds.observe(wall)
+        if call.ttft is not None:
+            self.ttft_seconds.observe(call.ttft)
+        if not call.error:
+            self.prompt_tokens.observe(call.prompt_tokens)
+            self.completion_tokens.observe(call.completion_tokens)
+
+        cost = completion_cost(call.prompt_tokens, call.completion_tokens)
+        logger.info(
+            "LLM call topic=%s difficulty=%s model=%s tokens=%d/%d wall=%.2fs ttft=%s "
+            "questions=%d/%d parse_failures=%d error=%s",
+            call.topic, call.difficulty, call.model,
+            call.prompt_tokens, call.completion_tokens, wall,
+            f"{call.ttft:.2f}s" if call.ttft is not None else "-",
+            call.validated, call.requested, call.parse_failures, call.error,
+        )
+        for counters in (
+            self.total,
+            self.by_model[call.model],
+            self.by_topic[(call.topic, call.difficulty)],
+        ):
+            counters.calls += 1
+            counters.errors += call.error
+            counters.prompt_tokens += call.prompt_tokens
+            counters.completion_tokens += call.completion_tokens
+            counters.requested += call.requested
+            counters.validated += call.validated
+            counters.parse_failures += call.parse_failures
+            counters.cost_usd += cost
+            counters.wall_seconds += wall
+
+    def snapshot(self) -> dict:
+        return {
+            "total": self.total.snapshot(),
+            "histograms": {
+                "wall_seconds": self.wall_seconds.snapshot(),
+                "ttft_seconds": self.ttft_seconds.snapshot(),
+                "prompt_tokens": self.prompt_tokens.snapshot(),
+                "completion_tokens": self.completion_tokens.snapshot(),
+            },
+            "by_model": {model: c.snapshot() for model, c in self.by_model.items()},
+            "by_topic": [
+                {"topic": topic, "difficulty": difficulty, **c.snapshot()}
+                for (topic, difficulty), c in sorted(self.by_topic.items())
+            ],
+        }
+
+
+# Singleton instance
+llm_metrics = LLMMetrics()
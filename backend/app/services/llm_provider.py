@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+from app.services.llm_cache import CachedCompletion
+
+
+@dataclass
+class StreamEvent:
+    """One piece of a streamed completion; usage arrives on the last event."""
+    text: str = ""
+    model: str = ""
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
+class LLMProvider:
+    """Chat-completion backend used by ``OpenAIService``.
+
+    ``open_stream`` returns once the response has started, so callers can
+    retry opening a stream without replaying one that broke half-way.
+    """
+
+    name = "base"
+
+    def __init__(self, model: str):
+        self.model = model
+
+    async def complete(
+        self,
+        messages: List[dict],
+        max_tokens: int,
+        temperature: float,
+    ) -> CachedCompletion:
+        raise NotImplementedError
+
+    async def open_stream(
+        self,
+        messages: List[dict],
+        max_tokens: int,
+        temperature: float,
+    ) -> AsyncIterator[StreamEvent]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+def stream_usage(chunk) -> Optional[Tuple[int, int]]:
+    """(prompt, completion) tokens from a stream chunk, if it reports usage.
+
+    The pinned SDK has no ``usage`` field on chunks, so it arrives as a plain dict.
+    """
+    usage = getattr(chunk, "usage", None)
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    return usage.prompt_tokens, usage.completion_tokens
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI chat completions API, or anything that speaks it (see ``app.llm_stub``)."""
+
+    name = "openai"
+
+    def __init__(self, model: str, api_key: str, base_url: Optional[str] = None):
+        super().__init__(model)
+        # Pooled keep-alive transport shared by every call in this worker
+        self.http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.OPENAI_TIMEOUT_SECONDS,
+                connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            # Retries are done by retry_transient so the circuit breaker sees each call once
+            max_retries=0,
+            http_client=self.http_client,
+        )
+
+    async def complete(
+        self,
+        messages: List[dict],
+        max_tokens: int,
+        temperature: float,
+    ) -> CachedCompletion:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+
+        completion = CachedCompletion(
+            content=response.choices[0].message.content or "",
+            model=response.model,
+        )
+        if response.usage is not None:
+            completion.prompt_tokens = response.usage.prompt_tokens
+            completion.completion_tokens = response.usage.completion_tokens
+        return completion
+
+    async def open_stream(
+        self,
+        messages: List[dict],
+        max_tokens: int,
+        temperature: float,
+    ) -> AsyncIterator[StreamEvent]:
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            # Not a typed argument in the pinned SDK, so sent as-is
+            extra_body={"stream_options": {"include_usage": True}},
+        )
+        return self._events(stream)
+
+    async def _events(self, stream) -> AsyncIterator[StreamEvent]:
+        async for chunk in stream:
+            event = StreamEvent(model=chunk.model)
+            # With include_usage the last chunk carries usage and no choices
+            usage = stream_usage(chunk)
+            if usage is not None:
+                event.prompt_tokens, event.completion_tokens = usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                event.text = chunk.choices[0].delta.content
+            yield event
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+def create_provider(name: str) -> LLMProvider:
+    """Build the provider selected by ``LLM_PROVIDER``."""
+    if name == "openai":
+        return OpenAIProvider(settings.OPENAI_MODEL, settings.OPENAI_API_KEY)
+    if name == "stub":
+        provider = OpenAIProvider(
+            settings.OPENAI_MODEL,
+            api_key=settings.OPENAI_API_KEY or "stub",
+            base_url=settings.LLM_STUB_URL,
+        )
+        provider.name = "stub"
+        return provider
+    if name == "fake":
+        # fake_llm subclasses LLMProvider, so import it lazily
+        from app.services.fake_llm import FakeProvider
+
+        return FakeProvider(
+            model=settings.OPENAI_MODEL,
+            latency_seconds=settings.LLM_FAKE_LATENCY_SECONDS,
+            tokens_per_second=settings.LLM_FAKE_TOKENS_PER_SECOND,
+            seed=settings.LLM_FAKE_SEED,
+        )
+    raise ValueError(f"Unknown LLM_PROVIDER: {name!r} (expected openai, stub or fake)")
@@ -1,11 +1,22 @@
+import asyncio
 import json
+import logging
 import re
-from typing import List
-
-from openai import OpenAI
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, TypeVar
 
 from app.core.config import settings
 from app.schemas import ClaudeQuestionSchema
+from app.services.json_stream import IncrementalArrayParser, ParseResult, parse_json_array
+from app.services.llm_cache import CachedCompletion, LLMCacheMiss, llm_cache
+from app.services.llm_metrics import llm_metrics
+from app.services.llm_provider import LLMProvider, create_provider
+from app.services.rate_limiter import llm_rate_limiter, estimate_tokens
+from app.services.resilience import llm_breaker, retry_transient
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 
 SYSTEM_PROMPT = """당신은 AICE Associate 자격증 전문 출제위원입니다.
@@ -23,13 +34,20 @@ SYSTEM_PROMPT = """당신은 AICE Associate 자격증 전문 출제위원입니
 - hard: 복합 개념, 실무 응용, 추론형"""
 
 
-def get_user_prompt(topic: str, difficulty: str, count: int) -> str:
+def get_user_prompt(topic: str, difficulty: str, count: int, part: int = 1, parts: int = 1) -> str:
+    part_hint = ""
+    if parts > 1:
+        part_hint = (
+            f"\n이 요청은 {parts}개 묶음 중 {part}번째입니다. "
+            "다른 묶음과 겹치지 않도록 서로 다른 세부 개념을 다루세요.\n"
+        )
+
     return f"""다음 조건으로 AICE Associate 문제 {count}개를 생성하세요.
 
 주제: {topic}
 난이도: {difficulty}
 문제 수: {count}개
-
+{part_hint}
 반드시 다음 JSON 배열 형식으로만 응답하세요:
 [
   {{
@@ -85,9 +103,70 @@ def validate_question(q: dict) -> bool:
     return True
 
 
+def log_parse_issues(parsed: ParseResult) -> None:
+    """Report items dropped while parsing a response."""
+    for issue in parsed.issues:
+        logger.warning("Skipped question #%d: %s (%r)", issue.index, issue.error, issue.snippet)
+
+
+def normalize_question(q: dict, difficulty: str) -> Optional[ClaudeQuestionSchema]:
+    """Validate a raw question and convert it to the internal schema."""
+    if not isinstance(q, dict) or not validate_question(q):
+        return None
+
+    # Normalize correct_answer to lowercase
+    q["correct_answer"] = q["correct_answer"].lower()
+    # Set difficulty if not present
+    if "difficulty" not in q:
+        q["difficulty"] = difficulty
+    return ClaudeQuestionSchema(**q)
+
+
+def build_messages(user_prompt: str) -> List[dict]:
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": user_prompt,
+        }
+    ]
+
+
+def question_key(question_text: str) -> str:
+    """Normalized question text used to drop duplicates."""
+    return re.sub(r"\s+", "", question_text).lower()
+
+
+def completion_budget(count: int) -> int:
+    """max_tokens for a completion that should return ``count`` questions."""
+    return min(settings.OPENAI_MAX_TOKENS, 200 + count * settings.OPENAI_TOKENS_PER_QUESTION)
+
+
 class OpenAIService:
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    """Question generation on top of the provider selected by ``LLM_PROVIDER``.
+
+    The provider (and its HTTP client) is created on first use, so importing
+    this module does not need an API key or a running event loop.
+    """
+
+    def __init__(self, provider: Optional[LLMProvider] = None):
+        self._provider = provider
+        # Bound the number of in-flight completions per worker
+        self.semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENT_REQUESTS)
+
+    @property
+    def provider(self) -> LLMProvider:
+        if self._provider is None:
+            self._provider = create_provider(settings.LLM_PROVIDER)
+        return self._provider
+
+    async def close(self) -> None:
+        if self._provider is not None:
+            await self._provider.close()
+            self._provider = None
 
     async def generate_questions(
         self,
@@ -95,45 +174,294 @@ class OpenAIService:
         difficulty: str,
         count: int,
     ) -> List[ClaudeQuestionSchema]:
-        """Generate questions using OpenAI GPT API."""
-        user_prompt = get_user_prompt(topic_name, difficulty, count)
+        """Generate questions using OpenAI GPT API.
+
+        The request is split into chunks of ``OPENAI_FANOUT_CHUNK_SIZE``
+        questions that run concurrently; the results are merged and
+        deduplicated by question text.
+        """
+        chunk_size = max(1, settings.OPENAI_FANOUT_CHUNK_SIZE)
+        sizes = [min(chunk_size, count - i) for i in range(0, count, chunk_size)]
+        fanout = asyncio.Semaphore(settings.OPENAI_FANOUT_CONCURRENCY)
+
+        async def run_chunk(size: int, part: int) -> List[ClaudeQuestionSchema]:
+            async with fanout:
+                return await self._generate_chunk(
+                    topic_name, difficulty, size, part=part, parts=len(sizes)
+                )
+
+        results = await asyncio.gather(
+            *(run_chunk(size, part) for part, size in enumerate(sizes, start=1)),
+            return_exceptions=True,
+        )
+
+        questions = []
+        seen = set()
+        errors = []
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(result)
+                continue
+            for question in result:
+                key = question_key(question.question_text)
+                if key not in seen:
+                    seen.add(key)
+                    questions.append(question)
+
+        if errors:
+            if not questions:
+                raise errors[0]
+            logger.warning("%d of %d generation chunks failed", len(errors), len(sizes))
+
+        return questions[:count]
+
+    async def _generate_chunk(
+        self,
+        topic_name: str,
+        difficulty: str,
+        count: int,
+        part: int = 1,
+        parts: int = 1,
+    ) -> List[ClaudeQuestionSchema]:
+        user_prompt = get_user_prompt(topic_name, difficulty, count, part=part, parts=parts)
+        call = llm_metrics.call(topic_name, difficulty, count)
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": SYSTEM_PROMPT,
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt,
-                    }
-                ],
-                max_tokens=4096,
-                temperature=0.7,
+            completion = await self.complete(
+                build_messages(user_prompt),
+                max_tokens=completion_budget(count),
             )
+            call.model = completion.model
+            call.prompt_tokens = completion.prompt_tokens
+            call.completion_tokens = completion.completion_tokens
 
-            content = response.choices[0].message.content
-            raw_questions = parse_gpt_response(content)
+            content = completion.content
+            parsed = parse_json_array(content)
+            log_parse_issues(parsed)
+            call.parse_failures = len(parsed.issues)
+            if not parsed.items and (parsed.issues or not content):
+                raise json.JSONDecodeError("no valid question objects", content, 0)
 
             validated_questions = []
-            for q in raw_questions:
-                if validate_question(q):
-                    # Normalize correct_answer to lowercase
-                    q["correct_answer"] = q["correct_answer"].lower()
-                    # Set difficulty if not present
-                    if "difficulty" not in q:
-                        q["difficulty"] = difficulty
-                    validated_questions.append(ClaudeQuestionSchema(**q))
+            for q in parsed.items:
+                question = normalize_question(q, difficulty)
+                if question is not None:
+                    validated_questions.append(question)
+            call.validated = len(validated_questions)
 
             return validated_questions
 
         except json.JSONDecodeError as e:
+            call.error = True
             raise ValueError(f"Failed to parse GPT response as JSON: {e}")
         except Exception as e:
+            call.error = True
+            raise ValueError(f"OpenAI API error: {e}")
+        finally:
+            llm_metrics.record(call)
+
+    async def complete(
+        self,
+        messages: List[dict],
+        max_tokens: int,
+        temperature: float = 0.7,
+    ) -> CachedCompletion:
+        """Run a chat completion through the response cache.
+
+        Usable for any prompt (generation, explanations, re-grading); misses
+        go through the rate limiter and the per-worker concurrency limit.
+        """
+        key = llm_cache.make_key(
+            self.provider.model,
+            messages,
+            provider=self.provider.name,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        return await llm_cache.get_or_create(
+            key, lambda: self._complete(messages, max_tokens, temperature)
+        )
+
+    async def _complete(
+        self,
+        messages: List[dict],
+        max_tokens: int,
+        temperature: float,
+    ) -> CachedCompletion:
+        estimated = estimate_tokens("".join(m["content"] for m in messages)) + max_tokens
+
+        async def attempt():
+            await llm_rate_limiter.acquire(estimated)
+            async with self.semaphore:
+                return await self.provider.complete(messages, max_tokens, temperature)
+
+        completion = await llm_breaker.call(lambda: self._with_retries(attempt))
+        if completion.prompt_tokens or completion.completion_tokens:
+            llm_rate_limiter.settle(
+                estimated, completion.prompt_tokens + completion.completion_tokens
+            )
+        return completion
+
+    @staticmethod
+    async def _with_retries(fn: Callable[[], Awaitable[T]]) -> T:
+        return await retry_transient(
+            fn,
+            retries=settings.OPENAI_MAX_RETRIES,
+            base_delay=settings.OPENAI_RETRY_BASE_DELAY_SECONDS,
+            max_delay=settings.OPENAI_RETRY_MAX_DELAY_SECONDS,
+        )
+
+    async def stream_questions(
+        self,
+        topic_name: str,
+        difficulty: str,
+        count: int,
+    ) -> AsyncIterator[ClaudeQuestionSchema]:
+        """Stream questions, yielding each one as soon as its JSON object is complete.
+
+        Split into concurrent chunks like ``generate_questions``, so no single
+        completion runs into the ``OPENAI_MAX_TOKENS`` cap; questions are
+        yielded in arrival order and deduplicated by text. Raises ValueError
+        only if every chunk failed before yielding anything.
+        """
+        chunk_size = max(1, settings.OPENAI_FANOUT_CHUNK_SIZE)
+        sizes = [min(chunk_size, count - i) for i in range(0, count, chunk_size)]
+        if len(sizes) == 1:
+            async for question in self._stream_chunk(topic_name, difficulty, count):
+                yield question
+            return
+
+        fanout = asyncio.Semaphore(settings.OPENAI_FANOUT_CONCURRENCY)
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        errors = []
+
+        async def run_chunk(size: int, part: int) -> None:
+            try:
+                async with fanout:
+                    async for question in self._stream_chunk(
+                        topic_name, difficulty, size, part=part, parts=len(sizes)
+                    ):
+                        queue.put_nowait(question)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                queue.put_nowait(finished)
+
+        tasks = [
+            asyncio.create_task(run_chunk(size, part))
+            for part, size in enumerate(sizes, start=1)
+        ]
+        seen = set()
+        running = len(tasks)
+        try:
+            while running and len(seen) < count:
+                item = await queue.get()
+                if item is finished:
+                    running -= 1
+                    continue
+                key = question_key(item.question_text)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield item
+        finally:
+            # The client may disconnect mid-stream; stop the remaining chunks
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if errors:
+            if not seen:
+                raise errors[0]
+            logger.warning("%d of %d streamed generation chunks failed", len(errors), len(sizes))
+
+    async def _stream_chunk(
+        self,
+        topic_name: str,
+        difficulty: str,
+        count: int,
+        part: int = 1,
+        parts: int = 1,
+    ) -> AsyncIterator[ClaudeQuestionSchema]:
+        user_prompt = get_user_prompt(topic_name, difficulty, count, part=part, parts=parts)
+        messages = build_messages(user_prompt)
+        max_tokens = completion_budget(count)
+        temperature = 0.7
+        parser = IncrementalArrayParser()
+        call = llm_metrics.call(topic_name, difficulty, count)
+
+        try:
+            key = llm_cache.make_key(
+                self.provider.model,
+                messages,
+                provider=self.provider.name,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+            cached = await llm_cache.get(key) if llm_cache.enabled else None
+            if cached is not None:
+                call.model = cached.model
+                for q in parser.feed(cached.content):
+                    question = normalize_question(q, difficulty)
+                    if question is not None:
+                        call.validated += 1
+                        yield question
+                return
+            if llm_cache.offline:
+                raise LLMCacheMiss(f"LLM cache miss in offline mode ({key[:12]})")
+
+            estimated = estimate_tokens(SYSTEM_PROMPT + user_prompt) + max_tokens
+            await llm_rate_limiter.acquire(estimated)
+            pieces = []
+            llm_breaker.before_call()
+            try:
+                async with self.semaphore:
+                    # Only opening the stream is retried; a broken stream is not replayed
+                    stream = await self._with_retries(
+                        lambda: self.provider.open_stream(messages, max_tokens, temperature)
+                    )
+
+                    async for event in stream:
+                        if event.completion_tokens is not None:
+                            call.prompt_tokens = event.prompt_tokens or 0
+                            call.completion_tokens = event.completion_tokens
+                        if not event.text:
+                            continue
+                        call.first_token()
+                        call.model = event.model or call.model
+                        pieces.append(event.text)
+                        for q in parser.feed(event.text):
+                            question = normalize_question(q, difficulty)
+                            if question is not None:
+                                call.validated += 1
+                                yield question
+            except Exception:
+                llm_breaker.record_failure()
+                raise
+            except BaseException:
+                llm_breaker.record_abandoned()
+                raise
+            llm_breaker.record_success()
+
+            parser.close()
+            log_parse_issues(ParseResult(issues=parser.issues, truncated=parser.truncated))
+            call.parse_failures = len(parser.issues)
+            if call.completion_tokens:
+                llm_rate_limiter.settle(estimated, call.prompt_tokens + call.completion_tokens)
+            if llm_cache.enabled:
+                await llm_cache.set(key, CachedCompletion(
+                    content="".join(pieces),
+                    model=call.model,
+                    prompt_tokens=call.prompt_tokens,
+                    completion_tokens=call.completion_tokens,
+                ))
+
+        except Exception as e:
+            call.error = True
             raise ValueError(f"OpenAI API error: {e}")
+        finally:
+            llm_metrics.record(call)
 
 
 # Singleton instance
@@ -0,0 +1,324 @@
+import asyncio
+import logging
+from typing import List, Optional, Sequence
+
+from sqlalchemy import select, insert, func, text
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models import Topic, Question, UserAnswer
+from app.schemas import ClaudeQuestionSchema
+from app.services.dedup_index import dedup_index
+from app.services.openai_service import openai_service
+from app.services.singleflight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+# Held by the worker that is currently refilling, so only one process calls the LLM
+REFILL_LOCK_KEY = 720_001
+
+
+def question_values(topic_id: int, q: ClaudeQuestionSchema) -> dict:
+    """Column values for a generated question."""
+    return {
+        "topic_id": topic_id,
+        "question_text": q.question_text,
+        "option_a": q.option_a,
+        "option_b": q.option_b,
+        "option_c": q.option_c,
+        "option_d": q.option_d,
+        "correct_answer": q.correct_answer,
+        "explanation": q.explanation,
+        "difficulty": q.difficulty,
+        "source": "gpt",
+    }
+
+
+async def insert_questions(
+    db: AsyncSession,
+    topic_id: int,
+    questions: Sequence[ClaudeQuestionSchema],
+) -> List[Question]:
+    """Insert generated questions in one ``INSERT ... RETURNING`` statement.
+
+    The returned rows are fully loaded (ids and server defaults included)
+    and in input order, so callers never need a per-row refresh.
+    """
+    if not questions:
+        return []
+    result = await db.scalars(
+        insert(Question).returning(Question, sort_by_parameter_order=True),
+        [question_values(topic_id, q) for q in questions],
+    )
+    return list(result.all())
+
+
+class QuestionInventory:
+    """Stock of pre-generated questions per (topic_id, difficulty) bucket.
+
+    The stock of a bucket is its active questions that have been answered
+    fewer than ``INVENTORY_MAX_USES`` times. A background task keeps every
+    bucket above the low-water mark so requests rarely need the LLM.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._lock_engine: Optional[AsyncEngine] = None
+        self._wakeup = asyncio.Event()
+        self._flights = SingleFlight()
+
+        self.fallbacks = 0
+        self.fallback_questions = 0
+
+    async def take(
+        self,
+        db: AsyncSession,
+        topic: Topic,
+        difficulty: str,
+        count: int,
+        user_id: int,
+    ) -> List[Question]:
+        """Take up to ``count`` inventory questions the user has not answered yet."""
+        answered = (
+            select(UserAnswer.answer_id)
+            .where(
+                UserAnswer.user_id == user_id,
+                UserAnswer.question_id == Question.question_id,
+            )
+            .exists()
+        )
+        result = await db.execute(
+            select(Question)
+            .where(
+                Question.topic_id == topic.topic_id,
+                Question.difficulty == difficulty,
+                Question.is_active == True,
+                Question.used_count < settings.INVENTORY_MAX_USES,
+                ~answered,
+            )
+            .order_by(Question.used_count, func.random())
+            .limit(count)
+        )
+        questions = list(result.scalars().all())
+
+        if len(questions) < count:
+            self.request_refill()
+        return questions
+
+    async def draw(
+        self,
+        db: AsyncSession,
+        topic: Topic,
+        difficulty: str,
+        count: int,
+        user_id: int,
+    ) -> List[Question]:
+        """Draw questions from the inventory, generating only the shortfall."""
+        questions = await self.take(db, topic, difficulty, count, user_id)
+
+        if len(questions) < count:
+            # Inventory miss: generate the rest on the request path
+            try:
+                new_questions = await self.generate(topic, difficulty, count - len(questions))
+            except ValueError:
+                new_questions = await self.fallback(
+                    db,
+                    topic,
+                    difficulty,
+                    count - len(questions),
+                    exclude_ids=[q.question_id for q in questions],
+                )
+                if not questions and not new_questions:
+                    raise
+                logger.warning(
+                    "Generation failed, serving %d inventory and %d fallback questions",
+                    len(questions),
+                    len(new_questions),
+                )
+            questions.extend(new_questions)
+
+        return questions
+
+    async def fallback(
+        self,
+        db: AsyncSession,
+        topic: Topic,
+        difficulty: str,
+        count: int,
+        exclude_ids: List[int],
+    ) -> List[Question]:
+        """Any bank questions for the topic, used when the LLM is unavailable.
+
+        Unlike ``take`` this ignores the use limit and what the user has
+        already answered, and prefers but does not require the difficulty.
+        """
+        query = (
+            select(Question)
+            .where(
+                Question.topic_id == topic.topic_id,
+                Question.is_active == True,
+            )
+            .order_by(Question.difficulty != difficulty, Question.used_count, func.random())
+            .limit(count)
+        )
+        if exclude_ids:
+            query = query.where(Question.question_id.not_in(exclude_ids))
+        result = await db.execute(query)
+        questions = list(result.scalars().all())
+
+        self.fallbacks += 1
+        self.fallback_questions += len(questions)
+        return questions
+
+    def stats(self) -> dict:
+        return {
+            "fallbacks": self.fallbacks,
+            "fallback_questions": self.fallback_questions,
+            "generations": self._flights.executions,
+            "coalesced_generations": self._flights.coalesced,
+            "generations_in_flight": self._flights.in_flight,
+        }
+
+    async def generate(self, topic: Topic, difficulty: str, count: int) -> List[Question]:
+        """Generate and save questions.
+
+        Concurrent identical requests share one in-flight generation, so LLM
+        calls scale with distinct requests rather than with concurrent users.
+        The questions are committed before any caller receives them.
+        """
+        return await self._flights.do(
+            (topic.topic_id, difficulty, count),
+            lambda: self._generate_and_save(topic, difficulty, count),
+        )
+
+    async def _generate_and_save(self, topic: Topic, difficulty: str, count: int) -> List[Question]:
+        generated = await openai_service.generate_questions(
+            topic_name=topic.name,
+            difficulty=difficulty,
+            count=count,
+        )
+        # Reject near-duplicates of the bank before paying to store them
+        accepted = dedup_index.filter_new(generated)
+        if not accepted:
+            return []
+        async with async_session_maker() as db:
+            questions = await insert_questions(db, topic.topic_id, [q for q, _ in accepted])
+            await db.commit()
+        for question, (_, sig) in zip(questions, accepted):
+            dedup_index.add(question.question_id, sig)
+        return questions
+
+    def request_refill(self) -> None:
+        """Wake the refill task before its next scheduled run."""
+        self._wakeup.set()
+
+    async def refill_once(self) -> int:
+        """Top up every bucket below the low-water mark. Returns questions added."""
+        # The session-level lock is held on its own autocommit connection
+        # outside the pool, so the refill (minutes of LLM calls) neither keeps
+        # a transaction open nor ties up a pooled connection
+        if self._lock_engine is None:
+            self._lock_engine = create_async_engine(
+                settings.DATABASE_URL, poolclass=NullPool, isolation_level="AUTOCOMMIT"
+            )
+        async with self._lock_engine.connect() as conn:
+            locked = await conn.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": REFILL_LOCK_KEY}
+            )
+            if not locked:
+                return 0
+            try:
+                return await self._refill_low_buckets()
+            finally:
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": REFILL_LOCK_KEY}
+                )
+
+    async def _refill_low_buckets(self) -> int:
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(Topic).where(Topic.is_active == True).order_by(Topic.display_order)
+            )
+            topics = result.scalars().all()
+
+            result = await db.execute(
+                select(
+                    Question.topic_id,
+                    Question.difficulty,
+                    func.count(Question.question_id).label("stock"),
+                )
+                .where(
+                    Question.is_active == True,
+                    Question.used_count < settings.INVENTORY_MAX_USES,
+                )
+                .group_by(Question.topic_id, Question.difficulty)
+            )
+            levels = {(row.topic_id, row.difficulty): row.stock for row in result}
+
+        added = 0
+        for topic in topics:
+            for difficulty in DIFFICULTIES:
+                stock = levels.get((topic.topic_id, difficulty), 0)
+                if stock < settings.INVENTORY_LOW_WATER_MARK:
+                    added += await self._refill_bucket(
+                        topic, difficulty, settings.INVENTORY_HIGH_WATER_MARK - stock
+                    )
+        return added
+
+    async def _refill_bucket(self, topic: Topic, difficulty: str, deficit: int) -> int:
+        added = 0
+        # Near-duplicate rejections can leave a batch short; bound the retries
+        attempts = 2 * -(-deficit // settings.INVENTORY_REFILL_BATCH_SIZE)
+        while added < deficit and attempts > 0:
+            attempts -= 1
+            batch = min(settings.INVENTORY_REFILL_BATCH_SIZE, deficit - added)
+            questions = await self._generate_and_save(topic, difficulty, batch)
+            if not questions:
+                break
+            added += len(questions)
+
+        logger.info("Refilled %s/%s with %d questions", topic.code, difficulty, added)
+        return added
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.refill_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Question inventory refill failed")
+
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=settings.INVENTORY_REFILL_INTERVAL_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._lock_engine is not None:
+            await self._lock_engine.dispose()
+            self._lock_engine = None
+
+
+# Singleton instance
+question_inventory = QuestionInventory()
@@ -0,0 +1,80 @@
+import asyncio
+import time
+from typing import Optional
+
+from app.core.config import settings
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.capacity = float(capacity or rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def credit(self, amount: float) -> None:
+        """Give back (or, if negative, take) tokens after the real cost is known."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class LLMRateLimiter:
+    """Process-wide limit on LLM requests and tokens per minute.
+
+    Callers reserve an estimated token cost before each call and settle it
+    with the provider-reported usage afterwards. Waiters are served in FIFO
+    order so a large request is not starved by a stream of small ones.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        async with self._lock:
+            while True:
+                wait = max(
+                    self.requests.delay_for(1),
+                    self.tokens.delay_for(estimated_tokens),
+                )
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            self.requests.consume(1)
+            self.tokens.consume(estimated_tokens)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        self.tokens.credit(estimated_tokens - actual_tokens)
+
+
+def estimate_tokens(text: str) -> int:
+    """Conservative token estimate; Korean text is close to one token per character."""
+    return len(text)
+
+
+# Singleton instance
+llm_rate_limiter = LLMRateLimiter(
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+)
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+import openai
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Errors worth retrying: the same request may succeed a moment later
+TRANSIENT_ERRORS = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.ConflictError,
+    httpx.TransportError,
+)
+
+
+class CircuitOpenError(ValueError):
+    """Raised instead of calling the provider while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failed calls in a row the breaker opens and
+    calls fail immediately with ``CircuitOpenError``. Once ``reset_seconds``
+    have passed a single trial call is let through (half-open); its outcome
+    closes the breaker again or re-opens it for another period.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        self.opened_count = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            return self.HALF_OPEN
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be rejected without reaching the provider."""
+        state = self.state
+        return state == self.OPEN or (state == self.HALF_OPEN and self._trial_in_flight)
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError("LLM provider unavailable (circuit open)")
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        trial = self._trial_in_flight
+        self._trial_in_flight = False
+        if trial or (self._state == self.CLOSED and self._failures >= self.failure_threshold):
+            logger.warning("LLM circuit opened after %d failures", self._failures)
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self.opened_count += 1
+
+    def record_abandoned(self) -> None:
+        """The caller gave up (cancelled); that says nothing about the provider."""
+        self._trial_in_flight = False
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self.before_call()
+        try:
+            result = await fn()
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.record_abandoned()
+            raise
+        self.record_success()
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened_count": self.opened_count,
+            "rejected": self.rejected,
+        }
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+async def retry_transient(
+    fn: Callable[[], Awaitable[T]],
+    retries: int,
+    base_delay: float,
+    max_delay: float,
+) -> T:
+    """Call ``fn``, retrying transient provider errors with jittered backoff."""
+    attempt = 0
+    while True:
+        try:
+            return await fn()
+        except TRANSIENT_ERRORS as e:
+            if attempt >= retries:
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            logger.info("Transient LLM error (%s), retry %d in %.2fs", e, attempt + 1, delay)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+# Singleton instance
+llm_breaker = CircuitBreaker(
+    failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=settings.LLM_BREAKER_RESET_SECONDS,
+)
@@ -0,0 +1,312 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import select, delete, func, case, cast, Date, Integer
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Question, StudySession, UserAnswer, MistakeNote, UserStats, UserDailyStats
+
+
+EMPTY_STATS = {
+    "total_questions": 0,
+    "total_correct": 0,
+    "total_sessions": 0,
+    "total_study_time_seconds": 0,
+    "open_mistakes": 0,
+    "total_mistakes": 0,
+    "sessions_started": 0,
+    "session_questions": 0,
+    "session_correct": 0,
+    "current_streak": 0,
+    "last_study_date": None,
+}
+
+
+# Counter updates are single upserts that add to the stored values, so
+# concurrent requests for the same user never lose an increment and the
+# caller's transaction decides whether they persist.
+
+async def _add(db: AsyncSession, user_id: int, **deltas: int) -> None:
+    stmt = insert(UserStats).values(user_id=user_id, **deltas)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                **{name: getattr(UserStats, name) + value for name, value in deltas.items()},
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def local_day(answered_at, zone_key: Optional[str] = None):
+    """SQL date of a naive UTC timestamp in ``zone_key`` (default: the rollup timezone)."""
+    zone_key = zone_key or settings.DEFAULT_TIMEZONE
+    return cast(func.timezone(zone_key, func.timezone("UTC", answered_at)), Date)
+
+
+def rollup_today():
+    """Today's rollup date in SQL, on the same clock as answered_at's server default."""
+    return cast(func.timezone(settings.DEFAULT_TIMEZONE, func.now()), Date)
+
+
+async def record_answers(
+    db: AsyncSession,
+    user_id: int,
+    by_topic: Dict[Optional[int], Tuple[int, int, int]],
+    new_mistakes: int,
+) -> None:
+    """Add (answers, correct, seconds) per topic to user_stats and today's rollup rows."""
+    await _add(
+        db,
+        user_id,
+        total_questions=sum(answers for answers, _, _ in by_topic.values()),
+        total_correct=sum(correct for _, correct, _ in by_topic.values()),
+        open_mistakes=new_mistakes,
+        total_mistakes=new_mistakes,
+    )
+
+    today = rollup_today()
+    stmt = insert(UserDailyStats).values([
+        {
+            "user_id": user_id,
+            "topic_id": topic_id,
+            "local_date": today,
+            "answers": answers,
+            "correct": correct,
+            "time_spent_seconds": seconds,
+        }
+        for topic_id, (answers, correct, seconds) in by_topic.items()
+    ])
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UserDailyStats.user_id, UserDailyStats.topic_id, UserDailyStats.local_date],
+            set_={
+                name: getattr(UserDailyStats, name) + stmt.excluded[name]
+                for name in ("answers", "correct", "time_spent_seconds")
+            },
+        )
+    )
+
+
+async def record_session_end(
+    db: AsyncSession, user_id: int, duration_seconds: int, questions: int, correct: int
+) -> None:
+    await _add(
+        db,
+        user_id,
+        total_sessions=1,
+        total_study_time_seconds=duration_seconds,
+        session_questions=questions,
+        session_correct=correct,
+    )
+
+
+async def record_session_start(db: AsyncSession, user_id: int, today: Optional[date] = None) -> None:
+    """Extend, keep or restart the streak for a session started ``today`` (UTC)."""
+    today = today or datetime.utcnow().date()
+    last = UserStats.last_study_date
+    stmt = insert(UserStats).values(
+        user_id=user_id, sessions_started=1, current_streak=1, last_study_date=today
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                "sessions_started": UserStats.sessions_started + 1,
+                "current_streak": case(
+                    (last >= today, UserStats.current_streak),
+                    (last == today - timedelta(days=1), UserStats.current_streak + 1),
+                    else_=1,
+                ),
+                "last_study_date": func.greatest(last, today),
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def displayed_streak(stats: UserStats, today: Optional[date] = None) -> int:
+    """The stored streak, or 0 once a full day has passed without studying."""
+    today = today or datetime.utcnow().date()
+    if stats.last_study_date is None or stats.last_study_date < today - timedelta(days=1):
+        return 0
+    return stats.current_streak
+
+
+async def study_streaks(db: AsyncSession, user_ids: Sequence[int]) -> Dict[int, Tuple[int, date]]:
+    """Latest run of consecutive study days per user, as (length, last day).
+
+    Gaps-and-islands in one query: consecutive dates minus their row number
+    give the same anchor date, so each run is one group. Cost depends on the
+    number of distinct study days scanned, not on round trips per day.
+    """
+    days = (
+        select(
+            StudySession.user_id.label("user_id"),
+            cast(StudySession.started_at, Date).label("day"),
+        )
+        .where(StudySession.user_id.in_(user_ids))
+        .distinct()
+        .subquery()
+    )
+    islands = select(
+        days.c.user_id,
+        days.c.day,
+        (
+            days.c.day
+            - cast(func.row_number().over(partition_by=days.c.user_id, order_by=days.c.day), Integer)
+        ).label("anchor"),
+    ).subquery()
+    runs = (
+        select(
+            islands.c.user_id,
+            func.count().label("length"),
+            func.max(islands.c.day).label("last_day"),
+        )
+        .group_by(islands.c.user_id, islands.c.anchor)
+        .subquery()
+    )
+    result = await db.execute(
+        select(runs.c.user_id, runs.c.length, runs.c.last_day)
+        .distinct(runs.c.user_id)
+        .order_by(runs.c.user_id, runs.c.last_day.desc())
+    )
+    return {user_id: (length, last_day) for user_id, length, last_day in result}
+
+
+async def rebuild_user_stats(db: AsyncSession, user_ids: Sequence[int]) -> int:
+    """Recompute ``user_stats`` for ``user_ids`` from the source tables.
+
+    Used for the backfill and to repair drift; existing rows are
+    overwritten. The caller commits. Returns the number of rows written.
+    """
+    if not user_ids:
+        return 0
+    totals: Dict[int, dict] = {user_id: {"user_id": user_id} for user_id in user_ids}
+
+    answers = await db.execute(
+        select(
+            UserAnswer.user_id,
+            func.count(),
+            func.coalesce(func.sum(cast(UserAnswer.is_correct, Integer)), 0),
+        )
+        .where(UserAnswer.user_id.in_(user_ids))
+        .group_by(UserAnswer.user_id)
+    )
+    for user_id, total, correct in answers:
+        totals[user_id].update(total_questions=total, total_correct=correct)
+
+    sessions = await db.execute(
+        select(
+            StudySession.user_id,
+            func.count(),
+            func.count().filter(StudySession.status == "completed"),
+            *(
+                func.coalesce(func.sum(column).filter(StudySession.status == "completed"), 0)
+                for column in (
+                    StudySession.duration_seconds,
+                    StudySession.questions_attempted,
+                    StudySession.correct_answers,
+                )
+            ),
+        )
+        .where(StudySession.user_id.in_(user_ids))
+        .group_by(StudySession.user_id)
+    )
+    for user_id, started, total, seconds, questions, correct in sessions:
+        totals[user_id].update(
+            sessions_started=started,
+            total_sessions=total,
+            total_study_time_seconds=seconds,
+            session_questions=questions,
+            session_correct=correct,
+        )
+
+    mistakes = await db.execute(
+        select(
+            MistakeNote.user_id,
+            func.count(),
+            func.count().filter(MistakeNote.mastered == False),
+        )
+        .where(MistakeNote.user_id.in_(user_ids))
+        .group_by(MistakeNote.user_id)
+    )
+    for user_id, total, open_total in mistakes:
+        totals[user_id].update(total_mistakes=total, open_mistakes=open_total)
+
+    for user_id, (streak, last_day) in (await study_streaks(db, user_ids)).items():
+        totals[user_id].update(current_streak=streak, last_study_date=last_day)
+
+    values = [{**EMPTY_STATS, **v} for v in totals.values()]
+    stmt = insert(UserStats).values(values)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                **{name: stmt.excluded[name] for name in EMPTY_STATS},
+                "updated_at": func.now(),
+            },
+        )
+    )
+    return len(values)
+
+
+async def daily_totals(
+    db: AsyncSession,
+    user_id: int,
+    date_from: date,
+    date_to: date,
+) -> Dict[date, Tuple[int, int, int]]:
+    """(answers, correct, seconds) per local day in [date_from, date_to], from the rollup."""
+    result = await db.execute(
+        select(
+            UserDailyStats.local_date,
+            func.sum(UserDailyStats.answers),
+            func.sum(UserDailyStats.correct),
+            func.sum(UserDailyStats.time_spent_seconds),
+        )
+        .where(
+            UserDailyStats.user_id == user_id,
+            UserDailyStats.local_date >= date_from,
+            UserDailyStats.local_date <= date_to,
+        )
+        .group_by(UserDailyStats.local_date)
+    )
+    # SUM(bigint) comes back as numeric
+    return {day: (answers, correct, int(seconds)) for day, answers, correct, seconds in result}
+
+
+async def rebuild_daily_stats(db: AsyncSession, user_ids: Sequence[int]) -> int:
+    """Recompute ``user_daily_stats`` for ``user_ids`` from ``user_answers``.
+
+    Rows are replaced in one DELETE and one INSERT ... SELECT; the caller
+    commits. Returns the number of rollup rows written.
+    """
+    if not user_ids:
+        return 0
+    await db.execute(delete(UserDailyStats).where(UserDailyStats.user_id.in_(user_ids)))
+
+    day = local_day(UserAnswer.answered_at)
+    rollup = (
+        select(
+            UserAnswer.user_id,
+            Question.topic_id,
+            day,
+            func.count(),
+            func.sum(cast(UserAnswer.is_correct, Integer)),
+            func.coalesce(func.sum(UserAnswer.time_spent_seconds), 0),
+        )
+        .join(Question, UserAnswer.question_id == Question.question_id)
+        .where(UserAnswer.user_id.in_(user_ids))
+        .group_by(UserAnswer.user_id, Question.topic_id, day)
+    )
+    result = await db.execute(
+        insert(UserDailyStats).from_select(
+            ["user_id", "topic_id", "local_date", "answers", "correct", "time_spent_seconds"],
+            rollup,
+        )
+    )
+    return result.rowcount
@@ -0,0 +1,88 @@
+"""Generation job worker.
+
+Run one or more of these next to the API: ``python -m app.worker``.
+Jobs are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED``, so workers can
+be added or removed freely.
+"""
+import asyncio
+import logging
+from typing import Set
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models import GenerationJob
+from app.schemas import QuestionGenerateRequest, SessionCreateRequest
+from app.api.questions import generate_for_user
+from app.api.study import start_session
+from app.services import openai_service, dedup_index
+from app.services.job_queue import claim_job, finish_job
+
+
+logger = logging.getLogger(__name__)
+
+
+async def run_job(job: GenerationJob) -> None:
+    result = None
+    error = None
+    async with async_session_maker() as db:
+        try:
+            if job.kind == "questions":
+                request = QuestionGenerateRequest.model_validate(job.payload)
+                response = await generate_for_user(db, job.user_id, request)
+            else:
+                request = SessionCreateRequest.model_validate(job.payload)
+                response = await start_session(db, job.user_id, request)
+            result = response.model_dump(mode="json")
+        except HTTPException as e:
+            error = str(e.detail)
+        except ValueError as e:
+            error = str(e)
+        except Exception as e:
+            logger.exception("Job %s failed", job.job_id)
+            error = f"Unexpected error: {e}"
+
+        if error is not None:
+            await db.rollback()
+        await finish_job(db, job, result=result, error=error)
+
+
+async def run_worker() -> None:
+    running: Set[asyncio.Task] = set()
+    while True:
+        if len(running) >= settings.WORKER_CONCURRENCY:
+            await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            continue
+
+        try:
+            async with async_session_maker() as db:
+                job = await claim_job(db)
+        except Exception:
+            logger.exception("Failed to claim a job")
+            job = None
+
+        if job is None:
+            await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+            continue
+
+        task = asyncio.create_task(run_job(job))
+        running.add(task)
+        task.add_done_callback(running.discard)
+
+
+async def main() -> None:
+    dedup_index.start()
+    try:
+        await run_worker()
+    finally:
+        await dedup_index.stop()
+        await openai_service.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,127 @@
+"""Commits/sec with and without the write-behind answer buffer.
+
+Submits N answers for one user over a few questions with a fixed number in
+flight, first on the direct path (one transaction per answer) and then with
+the answer buffer started on a temporary log directory. The buffered run
+includes the final stop(), so its numbers cover every answer reaching the
+database. Both runs must leave exactly N answers behind.
+
+Needs a migrated database at DATABASE_URL. Rows created here are removed.
+Run from backend/:  python -m benchmarks.bench_answer_ingest [answers] [concurrency]
+"""
+import asyncio
+import sys
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import delete, event, func, select, update
+
+import app.api.questions as questions_api
+from app.api.questions import submit_answer
+from app.core.database import async_session_maker, engine
+from app.models import Question, User, UserAnswer
+from app.schemas import AnswerSubmitRequest
+from app.services.answer_buffer import AnswerBuffer
+
+QUESTIONS = 20
+
+
+class CommitCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine.sync_engine, "commit", self._on_commit)
+
+    def _on_commit(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+async def create_user() -> int:
+    async with async_session_maker() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:12]}@example.com", password_hash="x", name="bench")
+        db.add(user)
+        await db.commit()
+        return user.user_id
+
+
+async def run(user_id: int, question_ids, total: int, concurrency: int) -> None:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def answer(i: int) -> None:
+        async with limit, async_session_maker() as db:
+            await submit_answer(
+                question_ids[i % len(question_ids)],
+                AnswerSubmitRequest(user_answer="abcd"[i % 4], time_spent_seconds=10),
+                db,
+                User(user_id=user_id),
+            )
+
+    await asyncio.gather(*[answer(i) for i in range(total)])
+
+
+async def measure(label: str, counter: CommitCounter, question_ids, total: int, concurrency: int, buffer=None):
+    user_id = await create_user()
+    before = counter.count
+    start = time.perf_counter()
+    if buffer is not None:
+        await buffer.start()
+    await run(user_id, question_ids, total, concurrency)
+    if buffer is not None:
+        await buffer.stop()
+    elapsed = time.perf_counter() - start
+    commits = counter.count - before
+
+    async with async_session_maker() as db:
+        written = await db.scalar(
+            select(func.count()).select_from(UserAnswer).where(UserAnswer.user_id == user_id)
+        )
+        await db.execute(delete(User).where(User.user_id == user_id))
+        await db.commit()
+
+    print(
+        f"{label:<10}{total / elapsed:>12.0f}{commits:>10}{commits / elapsed:>12.1f}{elapsed:>10.2f}"
+    )
+    assert written == total, f"{label}: {written} of {total} answers written"
+
+
+async def main(total: int, concurrency: int) -> None:
+    counter = CommitCounter()
+    async with async_session_maker() as db:
+        rows = (await db.execute(
+            select(Question.question_id, Question.used_count)
+            .order_by(Question.question_id)
+            .limit(QUESTIONS)
+        )).all()
+    question_ids = [row.question_id for row in rows]
+
+    print(f"{total} answers, {concurrency} in flight, {len(question_ids)} questions")
+    print(f"{'mode':<10}{'answers/s':>12}{'commits':>10}{'commits/s':>12}{'seconds':>10}")
+    try:
+        await measure("direct", counter, question_ids, total, concurrency)
+        with tempfile.TemporaryDirectory() as wal_dir:
+            buffer = AnswerBuffer(
+                wal_dir=wal_dir,
+                batch_size=500,
+                flush_interval=0.5,
+                max_pending=total,
+                key_cache_size=QUESTIONS,
+            )
+            # submit_answer routes through the module-level singleton
+            questions_api.answer_buffer = buffer
+            await measure("buffered", counter, question_ids, total, concurrency, buffer)
+            print(f"buffer: {buffer.batches} batches, {buffer.fsyncs} fsyncs")
+    finally:
+        async with async_session_maker() as db:
+            for row in rows:
+                await db.execute(
+                    update(Question)
+                    .where(Question.question_id == row.question_id)
+                    .values(used_count=row.used_count)
+                )
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    asyncio.run(main(*(args + [2000, 50][len(args):])))
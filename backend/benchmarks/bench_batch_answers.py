@@ -0,0 +1,90 @@
+"""Statements per batch answer submission.
+
+Submits 1, 10 and 50 answers (half of them wrong) to a fresh session through
+POST /api/study/sessions/{id}/answers and fails if the statement count grows
+with the batch size. Uses existing active questions.
+
+Needs a migrated database at DATABASE_URL. Rows created here are removed.
+Run from backend/:  python -m benchmarks.bench_batch_answers
+"""
+import asyncio
+import uuid
+
+from sqlalchemy import delete, event, select, update
+
+from app.api.study import insert_session, submit_session_answers
+from app.core.database import async_session_maker, engine
+from app.models import Question, User
+from app.schemas import SessionAnswersRequest
+
+BATCHES = (1, 10, 50)
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine.sync_engine, "commit", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+async def main() -> None:
+    counter = StatementCounter()
+    async with async_session_maker() as db:
+        questions = (await db.execute(
+            select(Question.question_id, Question.correct_answer, Question.used_count)
+            .where(Question.is_active == True)
+            .order_by(Question.question_id)
+            .limit(max(BATCHES))
+        )).all()
+        user = User(email=f"bench-{uuid.uuid4().hex[:12]}@example.com", password_hash="x", name="bench")
+        db.add(user)
+        await db.commit()
+        user_id = user.user_id
+    assert len(questions) >= max(BATCHES), f"needs {max(BATCHES)} active questions"
+
+    results = {}
+    try:
+        for size in BATCHES:
+            batch = questions[:size]
+            answers = [
+                {
+                    "question_id": qid,
+                    # Every other answer is wrong, to exercise the mistake upsert
+                    "user_answer": correct if i % 2 else ("a" if correct != "a" else "b"),
+                    "time_spent_seconds": 20,
+                }
+                for i, (qid, correct, _) in enumerate(batch)
+            ]
+            async with async_session_maker() as db:
+                session = await insert_session(db, user_id, None, "medium", size)
+                await db.commit()
+
+                before = counter.count
+                response = await submit_session_answers(
+                    session.session_id,
+                    SessionAnswersRequest(answers=answers),
+                    db,
+                    User(user_id=user_id),
+                )
+                results[size] = counter.count - before
+            assert response.questions_attempted == size
+            print(f"{size:>4} answers {results[size]:>4} statements")
+    finally:
+        async with async_session_maker() as db:
+            await db.execute(delete(User).where(User.user_id == user_id))
+            for qid, _, used_count in questions:
+                await db.execute(
+                    update(Question).where(Question.question_id == qid).values(used_count=used_count)
+                )
+            await db.commit()
+        await engine.dispose()
+
+    assert len(set(results.values())) == 1, f"statements depend on batch size: {results}"
+    print("OK: statements per batch are constant")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""Yearly history cost: raw answers versus the daily rollup.
+
+Spreads N answers over the last 365 days for a throw-away user, backfills
+user_daily_stats with rebuild_daily_stats, checks both paths agree, then
+times the per-day aggregation over raw user_answers against the rollup
+read used by the weekly, monthly and heatmap views.
+
+Needs a migrated database at DATABASE_URL. Rows created here are removed.
+Run from backend/:  python -m benchmarks.bench_daily_rollup
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Integer, cast, delete, func, insert, select
+
+from app.core.config import settings
+from app.core.database import async_session_maker, engine
+from app.models import Question, User, UserAnswer
+from app.services.user_stats import daily_totals, local_day, rebuild_daily_stats
+
+ANSWER_COUNTS = (1_000, 10_000, 50_000)
+DAYS = 365
+ROUNDS = 5
+
+
+async def raw_totals(db, user_id: int, date_from, date_to) -> dict:
+    day = local_day(UserAnswer.answered_at)
+    result = await db.execute(
+        select(
+            day,
+            func.count(),
+            func.sum(cast(UserAnswer.is_correct, Integer)),
+            func.coalesce(func.sum(UserAnswer.time_spent_seconds), 0),
+        )
+        .where(UserAnswer.user_id == user_id)
+        .group_by(day)
+    )
+    return {
+        row[0]: tuple(row[1:]) for row in result if date_from <= row[0] <= date_to
+    }
+
+
+async def timed(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await fn()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+async def main() -> None:
+    async with async_session_maker() as db:
+        question_ids = list((await db.scalars(select(Question.question_id).limit(50))).all())
+        user = User(email=f"bench-{uuid.uuid4().hex[:12]}@example.com", password_hash="x", name="bench")
+        db.add(user)
+        await db.commit()
+        user_id = user.user_id
+    assert question_ids, "needs at least one question in the database"
+
+    date_to = datetime.now(ZoneInfo(settings.DEFAULT_TIMEZONE)).date()
+    date_from = date_to - timedelta(days=DAYS - 1)
+    print(f"{'answers':>8}{'rollup rows':>13}{'raw ms':>9}{'rollup ms':>11}")
+    try:
+        for count in ANSWER_COUNTS:
+            async with async_session_maker() as db:
+                await db.execute(delete(UserAnswer).where(UserAnswer.user_id == user_id))
+                now = datetime.utcnow()
+                await db.execute(insert(UserAnswer), [
+                    {
+                        "user_id": user_id,
+                        "question_id": question_ids[i % len(question_ids)],
+                        "user_answer": "a",
+                        "is_correct": i % 3 != 0,
+                        "time_spent_seconds": 30,
+                        "answered_at": now - timedelta(minutes=i * DAYS * 24 * 60 // count),
+                    }
+                    for i in range(count)
+                ])
+                rows = await rebuild_daily_stats(db, [user_id])
+                await db.commit()
+
+                assert await raw_totals(db, user_id, date_from, date_to) == \
+                    await daily_totals(db, user_id, date_from, date_to)
+
+                raw_ms = await timed(lambda: raw_totals(db, user_id, date_from, date_to))
+                rollup_ms = await timed(lambda: daily_totals(db, user_id, date_from, date_to))
+            print(f"{count:>8}{rows:>13}{raw_ms:>9.2f}{rollup_ms:>11.2f}")
+    finally:
+        async with async_session_maker() as db:
+            await db.execute(delete(User).where(User.user_id == user_id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""Compare parse_gpt_response with the incremental array parser.
+
+Run from backend/:  python -m benchmarks.bench_json_parser
+"""
+import json
+import time
+
+from app.services.json_stream import IncrementalArrayParser, parse_json_array
+from app.services.openai_service import parse_gpt_response
+
+
+def make_question(i: int) -> dict:
+    return {
+        "question_text": f"다음 중 과적합(overfitting)을 줄이는 방법으로 가장 적절한 것은? ({i})",
+        "option_a": "학습 데이터의 양을 줄인다",
+        "option_b": "드롭아웃(Dropout)을 적용한다",
+        "option_c": "모델의 파라미터 수를 늘린다",
+        "option_d": "학습률을 크게 높인다",
+        "correct_answer": "b",
+        "explanation": "드롭아웃은 학습 시 일부 뉴런을 무작위로 비활성화하여 "
+                       "특정 뉴런에 대한 의존을 줄이고 일반화 성능을 높입니다. \"정규화\" 기법의 하나입니다.",
+        "difficulty": "medium",
+    }
+
+
+def recorded_responses() -> dict:
+    """Response shapes seen from the chat completions API."""
+    body = json.dumps([make_question(i) for i in range(20)], ensure_ascii=False, indent=2)
+    items = [json.dumps(make_question(i), ensure_ascii=False, indent=2) for i in range(20)]
+    broken = list(items)
+    broken[7] = broken[7].replace('"option_b"', '"option_b" "option_b2"', 1)
+    return {
+        "clean fenced": f"```json\n{body}\n```",
+        "prose + array": f"요청하신 문제입니다.\n\n{body}\n\n도움이 되길 바랍니다.",
+        "truncated at max_tokens": f"```json\n{body[: int(len(body) * 0.83)]}",
+        "one malformed item": "[\n" + ",\n".join(broken) + "\n]",
+    }
+
+
+def run_legacy(content: str) -> int:
+    try:
+        return len(parse_gpt_response(content))
+    except json.JSONDecodeError:
+        return 0
+
+
+def run_incremental(content: str) -> int:
+    return len(parse_json_array(content).items)
+
+
+def run_streamed(content: str, chunk_size: int = 16) -> int:
+    parser = IncrementalArrayParser()
+    count = 0
+    for i in range(0, len(content), chunk_size):
+        count += len(parser.feed(content[i:i + chunk_size]))
+    parser.close()
+    return count
+
+
+def bench(fn, content: str, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(content)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main(rounds: int = 500) -> None:
+    print(f"{'response':<26}{'parser':<14}{'items':>6}{'us/parse':>12}")
+    for name, content in recorded_responses().items():
+        for label, fn in (
+            ("legacy", run_legacy),
+            ("incremental", run_incremental),
+            ("streamed", run_streamed),
+        ):
+            print(f"{name:<26}{label:<14}{fn(content):>6}{bench(fn, content, rounds):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
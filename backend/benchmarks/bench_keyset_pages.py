@@ -0,0 +1,117 @@
+"""Page cost across a deep session list: keyset cursor versus OFFSET.
+
+Gives a throw-away user N completed sessions, scrolls GET /api/study/sessions
+and /history to the end with next_cursor, and checks every session came back
+exactly once and that ``total`` matches. It then times the first and the
+last page through the cursor against the same pages read with LIMIT/OFFSET.
+
+Needs a migrated database at DATABASE_URL. Rows created here are removed.
+Run from backend/:  python -m benchmarks.bench_keyset_pages
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+
+from app.api.study import get_history, get_sessions
+from app.core.database import async_session_maker, engine
+from app.models import StudySession, User
+from app.services.user_stats import rebuild_user_stats
+
+SESSION_COUNT = 50_000
+PAGE_SIZE = 50
+ROUNDS = 5
+
+
+async def timed(call) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await call()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def scroll(route, user: User) -> tuple:
+    """Follow next_cursor to the end; returns (session ids, total, cursor of the last page)."""
+    seen, cursor = [], None
+    while True:
+        async with async_session_maker() as db:
+            page = await route(PAGE_SIZE, cursor, db, user)
+        seen.extend(s.session_id for s in page.sessions)
+        if page.next_cursor is None:
+            total = page.total if hasattr(page, "total") else page.total_sessions
+            return seen, total, cursor
+        cursor = page.next_cursor
+
+
+async def offset_page(user_id: int, offset: int) -> None:
+    async with async_session_maker() as db:
+        await db.execute(
+            select(StudySession)
+            .where(StudySession.user_id == user_id)
+            .order_by(StudySession.started_at.desc())
+            .limit(PAGE_SIZE)
+            .offset(offset)
+        )
+
+
+async def main() -> None:
+    async with async_session_maker() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:12]}@example.com", password_hash="x", name="bench")
+        db.add(user)
+        await db.commit()
+        user_id = user.user_id
+
+    try:
+        now = datetime.utcnow()
+        async with async_session_maker() as db:
+            for chunk in range(0, SESSION_COUNT, 5_000):
+                await db.execute(insert(StudySession), [
+                    {
+                        "user_id": user_id,
+                        "status": "completed",
+                        # Pairs share a timestamp so the id tie-break is exercised
+                        "started_at": now - timedelta(minutes=(i // 2) * 30),
+                        "ended_at": now - timedelta(minutes=(i // 2) * 30 - 20),
+                        "questions_attempted": 10,
+                        "correct_answers": i % 11,
+                    }
+                    for i in range(chunk, min(chunk + 5_000, SESSION_COUNT))
+                ])
+            await rebuild_user_stats(db, [user_id])
+            await db.commit()
+
+        current = User(user_id=user_id)
+        last_pages = {}
+        for name, route in (("sessions", get_sessions), ("history", get_history)):
+            start = time.perf_counter()
+            seen, total, last_pages[name] = await scroll(route, current)
+            elapsed = time.perf_counter() - start
+            assert len(seen) == len(set(seen)) == SESSION_COUNT, f"{name}: {len(set(seen))} distinct"
+            assert total == SESSION_COUNT, f"{name}: total {total}"
+            print(f"{name}: {len(seen) // PAGE_SIZE} pages of {PAGE_SIZE} in {elapsed:.2f}s, no gaps or repeats")
+
+        async def cursor_page(cursor):
+            async with async_session_maker() as db:
+                await get_sessions(PAGE_SIZE, cursor, db, current)
+
+        print(f"\n{'page':<12}{'cursor ms':>12}{'offset ms':>12}")
+        for label, cursor, offset in (
+            ("first", None, 0),
+            ("last", last_pages["sessions"], SESSION_COUNT - PAGE_SIZE),
+        ):
+            by_cursor = await timed(lambda: cursor_page(cursor))
+            by_offset = await timed(lambda: offset_page(user_id, offset))
+            print(f"{label:<12}{by_cursor:>12.2f}{by_offset:>12.2f}")
+    finally:
+        async with async_session_maker() as db:
+            await db.execute(delete(User).where(User.user_id == user_id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
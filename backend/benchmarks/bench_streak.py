@@ -0,0 +1,95 @@
+"""Streak computation cost by streak length.
+
+Compares the former day-by-day loop (one COUNT per day), the single
+gaps-and-islands query used to rebuild user_stats, and the user_stats
+primary-key lookup the dashboard now reads.
+
+Needs a migrated database at DATABASE_URL. Rows created here are removed.
+Run from backend/:  python -m benchmarks.bench_streak
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import Date, cast, delete, func, insert, select
+
+from app.core.database import async_session_maker, engine
+from app.models import StudySession, User, UserStats
+from app.services.user_stats import rebuild_user_stats, study_streaks
+
+STREAKS = (1, 30, 100, 200, 365)
+ROUNDS = 5
+
+
+async def legacy_streak(db, user_id: int) -> int:
+    """The per-day loop previously used by the dashboard."""
+    today = datetime.utcnow().date()
+    streak = 0
+    current_date = today
+    while True:
+        count = await db.scalar(
+            select(func.count(StudySession.session_id)).where(
+                StudySession.user_id == user_id,
+                cast(StudySession.started_at, Date) == current_date,
+            )
+        )
+        if count:
+            streak += 1
+            current_date -= timedelta(days=1)
+        elif current_date == today:
+            current_date -= timedelta(days=1)
+        else:
+            break
+    return streak
+
+
+async def timed(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await fn()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+async def main() -> None:
+    async with async_session_maker() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:12]}@example.com", password_hash="x", name="bench")
+        db.add(user)
+        await db.commit()
+        user_id = user.user_id
+
+    print(f"{'streak':>7}{'loop ms':>10}{'query ms':>10}{'lookup ms':>11}")
+    try:
+        for length in STREAKS:
+            async with async_session_maker() as db:
+                await db.execute(delete(StudySession).where(StudySession.user_id == user_id))
+                now = datetime.utcnow()
+                await db.execute(insert(StudySession), [
+                    {
+                        "user_id": user_id,
+                        "status": "completed",
+                        "started_at": now - timedelta(days=day),
+                    }
+                    for day in range(length)
+                ])
+                await rebuild_user_stats(db, [user_id])
+                await db.commit()
+
+                assert await legacy_streak(db, user_id) == length
+                assert (await study_streaks(db, [user_id]))[user_id][0] == length
+
+                loop_ms = await timed(lambda: legacy_streak(db, user_id))
+                query_ms = await timed(lambda: study_streaks(db, [user_id]))
+                lookup_ms = await timed(lambda: db.scalar(
+                    select(UserStats.current_streak).where(UserStats.user_id == user_id)
+                ))
+            print(f"{length:>7}{loop_ms:>10.2f}{query_ms:>10.2f}{lookup_ms:>11.2f}")
+    finally:
+        async with async_session_maker() as db:
+            await db.execute(delete(User).where(User.user_id == user_id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
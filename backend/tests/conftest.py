@@ -0,0 +1,80 @@
+import asyncio
+import os
+import uuid
+
+# Generation uses the in-process fake provider; set before app modules read settings
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("LLM_FAKE_LATENCY_SECONDS", "0")
+os.environ.setdefault("LLM_FAKE_TOKENS_PER_SECOND", "1000000")
+os.environ.setdefault("LLM_CACHE_ENABLED", "False")
+os.environ.setdefault("DEBUG", "False")
+
+import pytest  # noqa: E402
+from sqlalchemy import delete, event, text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import async_session_maker, engine  # noqa: E402
+from app.models import User  # noqa: E402
+
+
+async def _database_reachable() -> bool:
+    probe = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with probe.connect() as conn:
+            await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=3)
+        return True
+    except Exception:
+        return False
+    finally:
+        await probe.dispose()
+
+
+def pytest_collection_modifyitems(config, items):
+    db_items = [item for item in items if "db" in item.keywords]
+    if db_items and not asyncio.run(_database_reachable()):
+        skip = pytest.mark.skip(reason=f"database not reachable at {settings.DATABASE_URL}")
+        for item in db_items:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+async def _dispose_engine():
+    # Pooled asyncpg connections belong to the test's event loop
+    yield
+    await engine.dispose()
+
+
+class StatementCounter:
+    """Counts statements and commits sent through the app engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+@pytest.fixture
+def statement_counter():
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    event.listen(engine.sync_engine, "commit", counter)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
+    event.remove(engine.sync_engine, "commit", counter)
+
+
+@pytest.fixture
+async def user_id():
+    """A throw-away user; everything it owns is removed afterwards."""
+    async with async_session_maker() as db:
+        user = User(email=f"test-{uuid.uuid4().hex[:12]}@example.com", password_hash="x", name="test")
+        db.add(user)
+        await db.commit()
+        user_id = user.user_id
+    yield user_id
+    async with async_session_maker() as db:
+        await db.execute(delete(User).where(User.user_id == user_id))
+        await db.commit()
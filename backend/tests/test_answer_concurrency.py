@@ -0,0 +1,130 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select, update
+
+from app.api.questions import submit_answer
+from app.api.study import insert_session
+from app.core.database import async_session_maker
+from app.models import MistakeNote, Question, StudySession, User, UserAnswer, UserDailyStats, UserStats
+from app.schemas import AnswerSubmitRequest
+
+pytestmark = pytest.mark.db
+
+CONCURRENCY = 50
+
+
+@pytest.fixture
+async def question():
+    """(question_id, correct_answer) of the first question; its used_count is restored afterwards."""
+    async with async_session_maker() as db:
+        question_id, correct, used_before = (await db.execute(
+            select(Question.question_id, Question.correct_answer, Question.used_count)
+            .order_by(Question.question_id)
+            .limit(1)
+        )).one()
+    yield question_id, correct
+    async with async_session_maker() as db:
+        await db.execute(
+            update(Question).where(Question.question_id == question_id).values(used_count=used_before)
+        )
+        await db.commit()
+
+
+async def answer(question_id: int, user_id: int, session_id, user_answer: str) -> None:
+    # One session per call, so every answer runs on its own connection
+    async with async_session_maker() as db:
+        await submit_answer(
+            question_id,
+            AnswerSubmitRequest(user_answer=user_answer, session_id=session_id),
+            db,
+            User(user_id=user_id),
+        )
+
+
+async def test_concurrent_answers_lose_no_updates(user_id, question):
+    question_id, correct = question
+    async with async_session_maker() as db:
+        used_before = await db.scalar(
+            select(Question.used_count).where(Question.question_id == question_id)
+        )
+        session = await insert_session(db, user_id, None, "medium", CONCURRENCY)
+        await db.commit()
+
+    wrong = "a" if correct != "a" else "b"
+    choices = [correct if i % 2 else wrong for i in range(CONCURRENCY)]
+    expected_correct = choices.count(correct)
+    await asyncio.gather(*[
+        answer(question_id, user_id, session.session_id, choice) for choice in choices
+    ])
+
+    async with async_session_maker() as db:
+        used_after = await db.scalar(
+            select(Question.used_count).where(Question.question_id == question_id)
+        )
+        attempted, session_correct = (await db.execute(
+            select(StudySession.questions_attempted, StudySession.correct_answers)
+            .where(StudySession.session_id == session.session_id)
+        )).one()
+        mistakes = await db.scalar(
+            select(MistakeNote.mistake_count).where(
+                MistakeNote.user_id == user_id, MistakeNote.question_id == question_id
+            )
+        )
+        stats = await db.get(UserStats, user_id)
+        daily = await db.scalar(
+            select(func.sum(UserDailyStats.answers)).where(UserDailyStats.user_id == user_id)
+        )
+
+    assert used_after - used_before == CONCURRENCY
+    assert (attempted, session_correct) == (CONCURRENCY, expected_correct)
+    assert mistakes == CONCURRENCY - expected_correct
+    assert (stats.total_questions, stats.total_correct) == (CONCURRENCY, expected_correct)
+    assert stats.open_mistakes == 1
+    assert daily == CONCURRENCY
+
+
+async def assert_rejected(question_id: int, user_id: int, session_id, used_before: int) -> None:
+    with pytest.raises(HTTPException) as error:
+        await answer(question_id, user_id, session_id, "a")
+    assert error.value.status_code == 404
+
+    # The whole statement was rolled back
+    async with async_session_maker() as db:
+        used_after = await db.scalar(
+            select(Question.used_count).where(Question.question_id == question_id)
+        )
+        answers = await db.scalar(select(func.count()).where(UserAnswer.user_id == user_id))
+    assert used_after == used_before
+    assert answers == 0
+
+
+async def test_answer_to_unknown_session_is_404(user_id, question):
+    question_id, _ = question
+    async with async_session_maker() as db:
+        used_before = await db.scalar(
+            select(Question.used_count).where(Question.question_id == question_id)
+        )
+    await assert_rejected(question_id, user_id, uuid.uuid4(), used_before)
+
+
+async def test_answer_to_foreign_session_is_404(user_id, question):
+    question_id, _ = question
+    async with async_session_maker() as db:
+        used_before = await db.scalar(
+            select(Question.used_count).where(Question.question_id == question_id)
+        )
+        owner = User(email=f"test-{uuid.uuid4().hex[:12]}@example.com", password_hash="x", name="test")
+        db.add(owner)
+        await db.commit()
+        owner_id = owner.user_id
+        session = await insert_session(db, owner_id, None, "medium", 10)
+        await db.commit()
+    try:
+        await assert_rejected(question_id, user_id, session.session_id, used_before)
+    finally:
+        async with async_session_maker() as db:
+            await db.execute(delete(User).where(User.user_id == owner_id))
+            await db.commit()
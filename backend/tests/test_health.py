@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+import httpx
+
+from app.main import app
+from app.services.fake_llm import FakeProvider
+from app.services.openai_service import OpenAIService
+
+GENERATION_LATENCY = 1.0
+HEALTH_BOUND = 0.2
+
+
+async def test_health_responds_during_slow_generation():
+    # A generation awaiting the provider must not block the event loop
+    service = OpenAIService(
+        provider=FakeProvider("fake-model", latency_seconds=GENERATION_LATENCY, tokens_per_second=1_000_000)
+    )
+    generation = asyncio.create_task(service.generate_questions("머신러닝", "medium", 5))
+    await asyncio.sleep(0.05)
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            start = time.perf_counter()
+            response = await client.get("/health")
+            elapsed = time.perf_counter() - start
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy"}
+        assert elapsed < HEALTH_BOUND
+        assert not generation.done()
+
+        questions = await generation
+        assert len(questions) == 5
+    finally:
+        generation.cancel()
+        await service.close()
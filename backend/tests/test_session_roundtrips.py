@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import delete, func, select, update
+
+from app.api.study import start_session
+from app.core.database import async_session_maker
+from app.models import Question, Topic
+from app.schemas import SessionCreateRequest
+from app.services import openai_service
+
+pytestmark = pytest.mark.db
+
+COUNTS = (5, 10, 20)
+DIFFICULTY = "easy"
+
+
+@pytest.fixture
+async def topic_id():
+    """The first topic, with its easy bucket restored and generated questions removed afterwards."""
+    async with async_session_maker() as db:
+        topic_id = await db.scalar(select(Topic.topic_id).order_by(Topic.topic_id).limit(1))
+        last_question_id = await db.scalar(select(func.coalesce(func.max(Question.question_id), 0)))
+        active_ids = (await db.scalars(
+            select(Question.question_id).where(
+                Question.topic_id == topic_id,
+                Question.difficulty == DIFFICULTY,
+                Question.is_active == True,
+            )
+        )).all()
+    yield topic_id
+    async with async_session_maker() as db:
+        await db.execute(delete(Question).where(Question.question_id > last_question_id))
+        if active_ids:
+            await db.execute(
+                update(Question).where(Question.question_id.in_(active_ids)).values(is_active=True)
+            )
+        await db.commit()
+    await openai_service.close()
+
+
+async def hide_stock(topic_id: int) -> None:
+    async with async_session_maker() as db:
+        await db.execute(
+            update(Question)
+            .where(Question.topic_id == topic_id, Question.difficulty == DIFFICULTY)
+            .values(is_active=False)
+        )
+        await db.commit()
+
+
+async def statements_for(counter, user_id: int, topic_id: int, count: int) -> int:
+    async with async_session_maker() as db:
+        before = counter.count
+        response = await start_session(
+            db,
+            user_id,
+            SessionCreateRequest(topic_id=topic_id, difficulty=DIFFICULTY, question_count=count),
+        )
+        statements = counter.count - before
+    assert response.question_count == count
+    return statements
+
+
+async def test_round_trips_do_not_grow_with_question_count(statement_counter, user_id, topic_id):
+    cold = {}
+    for count in COUNTS:
+        # Hide the stock so every question is generated and inserted
+        await hide_stock(topic_id)
+        cold[count] = await statements_for(statement_counter, user_id, topic_id, count)
+    assert len(set(cold.values())) == 1, cold
+
+    # The generated questions are now stock the user has not answered
+    warm = {
+        count: await statements_for(statement_counter, user_id, topic_id, count)
+        for count in COUNTS
+    }
+    assert len(set(warm.values())) == 1, warm
@@ -11,7 +11,7 @@ export default function MistakesPage() {
   useEffect(() => {
     const fetchMistakes = async () => {
       try {
-        const response = await studyApi.getMistakes(50, 0, false);
+        const response = await studyApi.getMistakes(50, undefined, false);
         setMistakes(response.mistakes);
       } catch (error) {
         console.error('Failed to fetch mistakes:', error);
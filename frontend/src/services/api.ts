@@ -124,23 +124,23 @@ export const studyApi = {
     return response.data;
   },
 
-  getSessions: async (limit = 10, offset = 0): Promise<SessionListResponse> => {
+  getSessions: async (limit = 10, cursor?: string): Promise<SessionListResponse> => {
     const response = await api.get('/study/sessions', {
-      params: { limit, offset },
+      params: { limit, cursor },
     });
     return response.data;
   },
 
-  getMistakes: async (limit = 20, offset = 0, mastered?: boolean): Promise<MistakeListResponse> => {
+  getMistakes: async (limit = 20, cursor?: string, mastered?: boolean): Promise<MistakeListResponse> => {
     const response = await api.get('/study/mistakes', {
-      params: { limit, offset, mastered },
+      params: { limit, cursor, mastered },
     });
     return response.data;
   },
 
-  getHistory: async (limit = 10): Promise<StudyHistoryResponse> => {
+  getHistory: async (limit = 10, cursor?: string): Promise<StudyHistoryResponse> => {
     const response = await api.get('/study/history', {
-      params: { limit },
+      params: { limit, cursor },
     });
     return response.data;
   },
@@ -111,6 +111,8 @@ export interface SessionResult {
 export interface SessionListResponse {
   sessions: Session[];
   count: number;
+  total: number;
+  next_cursor: string | null;
 }
 
 // Mistake types
@@ -128,6 +130,8 @@ export interface MistakeNote {
 export interface MistakeListResponse {
   mistakes: MistakeNote[];
   count: number;
+  total: number;
+  next_cursor: string | null;
 }
 
 // Dashboard types
@@ -176,4 +180,5 @@ export interface StudyHistoryResponse {
   total_questions: number;
   total_correct: number;
   overall_accuracy: number | null;
+  next_cursor: string | null;
 }